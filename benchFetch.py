@@ -0,0 +1,151 @@
+# Fetch-pipeline benchmark for departure_boardmk2.py
+#
+# Record real LDBWS responses once, then replay them offline with simulated latency,
+# jitter, 503s and timeouts. The benchmark times fetch_departures() per station
+# refresh and counts the SOAP requests each refresh makes, cold (empty service details
+# cache) and warm. The circuit breakers are reset before every refresh, so each one
+# really goes to the (replayed) network; a refresh that still returns no board is
+# counted as failed and left out of the latency figures. Requests are not rate limited
+# unless --rate is given.
+#
+#   python3 benchFetch.py --record                     # needs the API key and network
+#   python3 benchFetch.py                              # replay offline
+#   python3 benchFetch.py --latency 0.4 --jitter 0.2 --error-rate 0.1 --timeout-rate 0.02
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASE_CONFIG = os.path.join(HERE, "configmk2.json")
+MODES = {"details": False, "with-details": True}
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def load_board(args):
+    with open(BASE_CONFIG) as f:
+        config = json.load(f)
+    config.update({
+        "HEADLESS": True,
+        "TEST_MODE": False,
+        "SOAP_TRANSPORT": "record" if args.record else "replay",
+        "SOAP_RECORDING_DIR": os.path.abspath(args.recordings),
+        "REPLAY_LATENCY": args.latency,
+        "REPLAY_JITTER": args.jitter,
+        "REPLAY_ERROR_RATE": args.error_rate,
+        "REPLAY_TIMEOUT_RATE": args.timeout_rate,
+        "REPLAY_TIMEOUT": args.timeout,
+        "REPLAY_SEED": args.seed,
+        "LDBWS_REQUESTS_PER_SECOND": args.rate,
+    })
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump(config, f)
+        config_path = f.name
+    os.environ["DEPARTURE_BOARD_CONFIG"] = config_path
+    os.chdir(HERE)
+    try:
+        import departure_boardmk2 as board
+    finally:
+        os.unlink(config_path)
+    # the SOAP client is built on a background thread at import
+    board.network_ready.wait()
+    if board.soap_client is None:
+        sys.exit(f"Could not build the SOAP client from {args.recordings}; run with --record first (see departure_boardmk2.log)")
+    return board
+
+
+def refresh(board, station_code):
+    transport = board.soap_transport
+    calls_before = sum(transport.calls.values())
+    failures_before = sum(transport.failures.values())
+    # an earlier refresh's failures must not short-circuit this one
+    board.ldbws_breaker.reset()
+    board.station_breaker.reset()
+    start = time.perf_counter()
+    departures = board.fetch_departures(station_code)
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds": elapsed,
+        "requests": sum(transport.calls.values()) - calls_before,
+        "failures": sum(transport.failures.values()) - failures_before,
+        "failed": departures is None,
+        "rows": len(departures or []),
+    }
+
+
+# Latency, requests and rows are over the refreshes that returned a board
+def summarise(samples):
+    good = [sample for sample in samples if not sample["failed"]]
+    times = [sample["seconds"] for sample in good]
+    return {
+        "refreshes": len(samples),
+        "failed": len(samples) - len(good),
+        "mean_ms": round(1000 * sum(times) / len(times), 1) if good else None,
+        "p95_ms": round(1000 * percentile(times, 0.95), 1) if good else None,
+        "requests_per_refresh": round(sum(sample["requests"] for sample in good) / len(good), 1) if good else None,
+        "failures": sum(sample["failures"] for sample in samples),
+        "rows": round(sum(sample["rows"] for sample in good) / len(good), 1) if good else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark departure_boardmk2 fetching against recorded LDBWS responses")
+    parser.add_argument("--record", action="store_true", help="call LDBWS for real and save the responses")
+    parser.add_argument("--recordings", default=os.path.join(HERE, "recordings"))
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--refreshes", type=int, default=5, help="warm refreshes per station after the cold one")
+    parser.add_argument("--latency", type=float, default=0.15, help="seconds per replayed request")
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with a 503")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="share of requests that time out")
+    parser.add_argument("--timeout", type=float, default=5.0, help="seconds a replayed timeout takes")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--rate", type=float, default=0, help="LDBWS requests per second allowed; 0 for no limit")
+    parser.add_argument("--output", help="write results as JSON")
+    args = parser.parse_args()
+
+    board = load_board(args)
+    station_codes = list(board.STATIONS)
+    results = {}
+
+    for mode in args.modes:
+        board.USE_BOARD_WITH_DETAILS = MODES[mode]
+        board.service_details_cache = board.ServiceDetailsCache(board.SERVICE_DETAILS_TTL, board.SERVICE_DETAILS_CACHE_SIZE)
+        board.ldbws_breaker.reset()
+        board.station_breaker.reset()
+        cold = [refresh(board, code) for code in station_codes]
+        if args.record:
+            print(f"{mode}: recorded {sum(sample['requests'] for sample in cold)} responses for {', '.join(station_codes)}")
+            continue
+        warm = [refresh(board, code) for _ in range(args.refreshes) for code in station_codes]
+        results[mode] = {"cold": summarise(cold), "warm": summarise(warm) if warm else None}
+
+    if args.record:
+        return
+
+    rate = f"{args.rate} req/s" if args.rate else "unlimited"
+    print(f"replay latency {args.latency}s +/- {args.jitter}s, 503 rate {args.error_rate}, timeout rate {args.timeout_rate}, rate {rate}")
+    print(f"{'mode':14} {'cache':6} {'refreshes':>9} {'failed':>6} {'mean ms':>9} {'p95 ms':>9} {'req/refresh':>12} {'failures':>9} {'rows':>6}")
+    for mode, result in results.items():
+        for cache in ("cold", "warm"):
+            summary = result[cache]
+            if summary:
+                print(
+                    f"{mode:14} {cache:6} {summary['refreshes']:>9} {summary['failed']:>6} {str(summary['mean_ms']):>9} {str(summary['p95_ms']):>9} "
+                    f"{str(summary['requests_per_refresh']):>12} {summary['failures']:>9} {str(summary['rows']):>6}"
+                )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+# Render benchmark for departure_boardmk2.py
+#
+# Builds synthetic boards and times each rendering phase offscreen at the
+# resolutions we actually run. Every scenario runs in its own process with its
+# own config, so fonts, window size and ROTATE_DISPLAY are set up exactly as at
+# import time on the real board.
+#
+#   python3 benchRender.py                                # production matrix
+#   python3 benchRender.py --rows 7 --calling-points 30 --output before.json
+#   python3 benchRender.py --rows 7 --calling-points 30 --compare before.json
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASE_CONFIG = os.path.join(HERE, "configmk2.json")
+PHASES = ["board_build", "board_refresh", "static_compose", "scroll", "overlay", "present", "frame"]
+
+
+def synthetic_departures(rows, calling_points):
+    departures = []
+    for i in range(rows):
+        stops = ", ".join(f"Station Number {j} ({12 + j // 4}:{(j * 7) % 60:02d})" for j in range(calling_points))
+        status = "On time" if i % 3 else f"Exp 12:{i:02d}"
+        departures.append((f"12:{i:02d}", f"Destination {i}", str(i % 8), stops, status, "Great Western Railway"))
+    return departures
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def timing(values):
+    return {
+        "mean_ms": round(1000 * sum(values) / len(values), 3),
+        "p95_ms": round(1000 * percentile(values, 0.95), 3),
+    }
+
+
+# === Child: runs one scenario inside a freshly imported board ===
+def run_scenario(scenario, frames):
+    os.chdir(HERE)
+    import departure_boardmk2 as board
+    import pygame
+
+    departures = synthetic_departures(scenario["rows"], scenario["calling_points"])
+    static_text = []
+    scrolling_texts = []
+    static_surface = pygame.Surface((board.WINDOW_WIDTH, board.WINDOW_HEIGHT)).convert()
+    renderer = board.DirtyRenderer((board.WINDOW_WIDTH, board.WINDOW_HEIGHT))
+    samples = {phase: [] for phase in PHASES}
+
+    # Board build and compose happen once per data refresh
+    tracemalloc.start()
+    for _ in range(10):
+        start = time.perf_counter()
+        board.update_display_multi_platform_with_calling_at(departures, static_text, scrolling_texts)
+        samples["board_build"].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        board.compose_static_surface(static_surface, static_text)
+        samples["static_compose"].append(time.perf_counter() - start)
+    build_allocated = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    # A typical refresh: same services, one expected time changed, rows kept between calls
+    rows = {}
+    board.update_display_multi_platform_with_calling_at(departures, static_text, scrolling_texts, rows)
+    for i in range(10):
+        refreshed = list(departures)
+        if refreshed:
+            row = refreshed[i % len(refreshed)]
+            refreshed[i % len(refreshed)] = row[:4] + (f"Exp 13:{i:02d}",) + row[5:]
+        start = time.perf_counter()
+        board.update_display_multi_platform_with_calling_at(refreshed, static_text, scrolling_texts, rows)
+        samples["board_refresh"].append(time.perf_counter() - start)
+    board.compose_static_surface(static_surface, static_text)
+
+    renderer.back.blit(static_surface, (0, 0))
+    renderer.mark_all()
+    renderer.present(board.screen)
+    text_height = board.train_font.get_height()
+    overlay_rects = []
+    station_name = "Bridgend"
+
+    tracemalloc.start()
+    snapshot_start = tracemalloc.take_snapshot()
+    for frame in range(frames):
+        frame_start = time.perf_counter()
+
+        start = time.perf_counter()
+        for text in scrolling_texts:
+            clip_rect = pygame.Rect(text.x_start, text.y_pos, text.clip_width, text_height)
+            renderer.back.blit(static_surface, clip_rect, clip_rect)
+            text.update()
+            text.draw(renderer.back, clip_rect)
+            renderer.mark(clip_rect)
+        samples["scroll"].append(time.perf_counter() - start)
+
+        # Worst case: the clock text changes every frame
+        start = time.perf_counter()
+        for rect in overlay_rects:
+            renderer.back.blit(static_surface, rect, rect)
+            renderer.mark(rect)
+        clock_text = f"12:{(frame // 60) % 60:02d}:{frame % 60:02d}"
+        overlay_rects = board.draw_overlay(renderer.back, clock_text, "12°C", station_name)
+        for rect in overlay_rects:
+            renderer.mark(rect)
+        samples["overlay"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        renderer.present(board.screen)
+        samples["present"].append(time.perf_counter() - start)
+
+        samples["frame"].append(time.perf_counter() - frame_start)
+    snapshot_end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    frame_allocations = sum(stat.size_diff for stat in snapshot_end.compare_to(snapshot_start, "filename") if stat.size_diff > 0)
+    frame_mean = sum(samples["frame"]) / len(samples["frame"])
+    result = dict(scenario)
+    result.update({phase: timing(values) for phase, values in samples.items()})
+    result["fps"] = round(1 / frame_mean, 1) if frame_mean else None
+    result["board_build_peak_bytes"] = build_allocated
+    result["frame_alloc_bytes"] = round(frame_allocations / frames)
+    print(json.dumps(result))
+
+
+# === Parent: builds configs and collects results ===
+def scenario_config(scenario, base):
+    config = dict(base)
+    width, height = scenario["resolution"]
+    config.update({
+        "HEADLESS": True,
+        "TEST_MODE": True,
+        "FULLSCREEN": False,
+        "WINDOW_WIDTH": width,
+        "WINDOW_HEIGHT": height,
+        "ROTATE_DISPLAY": scenario["rotate"],
+    })
+    return config
+
+
+def run_child(scenario, frames, base):
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump(scenario_config(scenario, base), f)
+        config_path = f.name
+    try:
+        env = dict(os.environ, DEPARTURE_BOARD_CONFIG=config_path)
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", json.dumps(scenario), "--frames", str(frames)],
+            env=env, capture_output=True, text=True, check=True,
+        )
+    finally:
+        os.unlink(config_path)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def scenario_key(result):
+    width, height = result["resolution"]
+    return f"{width}x{height} rows={result['rows']} cp={result['calling_points']} rot={'on' if result['rotate'] else 'off'}"
+
+
+def print_table(results, previous):
+    print(f"{'scenario':44} {'fps':>7} {'frame':>8} {'scroll':>8} {'overlay':>8} {'present':>8} {'build':>8} {'refresh':>8} {'alloc/f':>8}")
+    for result in results:
+        key = scenario_key(result)
+        line = (
+            f"{key:44} {result['fps']:>7} {result['frame']['mean_ms']:>8} {result['scroll']['mean_ms']:>8} "
+            f"{result['overlay']['mean_ms']:>8} {result['present']['mean_ms']:>8} "
+            f"{result['board_build']['mean_ms']:>8} {result['board_refresh']['mean_ms']:>8} {result['frame_alloc_bytes']:>8}"
+        )
+        before = previous.get(key)
+        if before:
+            change = 100 * (result["frame"]["mean_ms"] - before["frame"]["mean_ms"]) / before["frame"]["mean_ms"]
+            line += f"  frame {change:+.1f}%"
+        print(line)
+    print("times are mean ms per frame (build: full board, refresh: one changed row); alloc/f is bytes allocated per frame")
+
+
+def parse_resolution(text):
+    width, height = text.lower().split("x")
+    return [int(width), int(height)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark departure_boardmk2 rendering")
+    parser.add_argument("--resolutions", nargs="+", default=[[2560, 1440]], type=parse_resolution)
+    parser.add_argument("--rows", nargs="+", default=[1, 4, 7], type=int)
+    parser.add_argument("--calling-points", nargs="+", default=[0, 10, 30], type=int)
+    parser.add_argument("--rotate", choices=["off", "on", "both"], default="both")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--output", help="write results as JSON for a later --compare")
+    parser.add_argument("--compare", help="JSON from an earlier --output run")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_scenario(json.loads(args.child), args.frames)
+        return
+
+    with open(BASE_CONFIG) as f:
+        base = json.load(f)
+    rotations = {"off": [False], "on": [True], "both": [False, True]}[args.rotate]
+
+    results = []
+    for resolution in args.resolutions:
+        for rows in args.rows:
+            for calling_points in args.calling_points:
+                for rotate in rotations:
+                    scenario = {"resolution": resolution, "rows": rows, "calling_points": calling_points, "rotate": rotate}
+                    results.append(run_child(scenario, args.frames, base))
+                    print(f"done {scenario_key(results[-1])}", file=sys.stderr)
+
+    previous = {}
+    if args.compare:
+        with open(args.compare) as f:
+            previous = {scenario_key(result): result for result in json.load(f)}
+    print_table(results, previous)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
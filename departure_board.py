@@ -1,12 +1,13 @@
+import time
+# startup timing includes the imports below
+BOOT_START = time.perf_counter()
 import pygame
-import zeep
 from datetime import datetime
 import json
-import time
 import logging
-import requests
 import sys
 from json import JSONDecodeError
+import threading
 
 # === Setup logging ===
 logging.basicConfig(
@@ -15,6 +16,22 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(message)s",
 )
 
+# === Startup timing ===
+# (phase, seconds) in the order phases finish, from the main thread and from
+# init_network(); logged when the first frame and the first board are on screen.
+boot_phases = []
+
+def boot_mark(phase, started):
+    now = time.perf_counter()
+    boot_phases.append((phase, now - started))
+    return now
+
+def log_startup(milestone):
+    phases = ", ".join(f"{phase} {1000 * seconds:.0f} ms" for phase, seconds in boot_phases)
+    logging.info(f"Startup: {milestone} at {1000 * (time.perf_counter() - BOOT_START):.0f} ms ({phases})")
+
+boot_clock = boot_mark("imports", BOOT_START)
+
 # === Load configuration safely ===
 CONFIG_PATH = "config.json"
 SAMPLE_CONFIG = {
@@ -79,21 +96,47 @@ STATUS_FONT_SIZE = config.get("STATUS_FONT_SIZE", 50)
 WINDOW_WIDTH = config.get("WINDOW_WIDTH", 800)
 WINDOW_HEIGHT = config.get("WINDOW_HEIGHT", 480)
 FULLSCREEN = config.get("FULLSCREEN", False)
+WSDL_VERSION = config.get("WSDL_VERSION", "2021-11-01")
+WSDL_CACHE_DIR = config.get("WSDL_CACHE_DIR", "wsdl_cache")
+USE_BOARD_WITH_DETAILS = config.get("USE_BOARD_WITH_DETAILS", False)
+# LDBWS returns at most 10 services from the with-details board calls
+DETAILS_BOARD_MAX_ROWS = 10
+boot_clock = boot_mark("config", boot_clock)
 
 # === Setup SOAP client ===
-WSDL_URL = "https://lite.realtime.nationalrail.co.uk/OpenLDBWS/wsdl.aspx"
+# zeep and the SOAP client (which may have to download the WSDL) are set up by
+# init_network() on a background thread once the splash is up. network_ready is set
+# when it finishes, whether or not it succeeded; main() doesn't fetch until then.
+WSDL_URL = f"https://lite.realtime.nationalrail.co.uk/OpenLDBWS/wsdl.aspx?ver={WSDL_VERSION}"
 soap_client = None
 soap_header_value = None
-try:
-    soap_client = zeep.Client(wsdl=WSDL_URL)
-    header = zeep.xsd.Element(
-        "{http://thalesgroup.com/RTTI/2013-11-28/Token/types}AccessToken",
-        zeep.xsd.ComplexType([zeep.xsd.Element("TokenValue", zeep.xsd.String())]),
-    )
-    soap_header_value = header(TokenValue=API_KEY)
-except Exception as e:
-    logging.error(f"SOAP client init failed: {e}")
-    TEST_MODE = True
+network_ready = threading.Event()
+
+def init_network():
+    global soap_client, soap_header_value, TEST_MODE
+    started = time.perf_counter()
+    try:
+        import zeep
+        from soap_transport import CachingTransport
+        started = boot_mark("network imports", started)
+
+        # WSDL and XSDs come from the local cache when present and are revalidated in the background
+        soap_transport = CachingTransport(WSDL_CACHE_DIR, WSDL_VERSION)
+        client = zeep.Client(wsdl=WSDL_URL, transport=soap_transport)
+        if soap_transport.served_from_cache:
+            threading.Thread(target=soap_transport.revalidate, name="wsdl-revalidate", daemon=True).start()
+        header = zeep.xsd.Element(
+            "{http://thalesgroup.com/RTTI/2013-11-28/Token/types}AccessToken",
+            zeep.xsd.ComplexType([zeep.xsd.Element("TokenValue", zeep.xsd.String())]),
+        )
+        soap_header_value = header(TokenValue=API_KEY)
+        soap_client = client
+        boot_mark("SOAP client", started)
+    except Exception as e:
+        logging.error(f"SOAP client init failed: {e}")
+        TEST_MODE = True
+    finally:
+        network_ready.set()
 
 # === Service details cache ===
 service_details_cache = {}
@@ -111,6 +154,7 @@ else:
     screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
 
 WINDOW_WIDTH, WINDOW_HEIGHT = screen.get_size()
+boot_clock = boot_mark("display", boot_clock)
 
 BLACK = (0,0,0)
 ORANGE = (255,165,0)
@@ -129,6 +173,26 @@ except:
     platform_font = pygame.font.SysFont(None, PLATFORM_FONT_SIZE)
     train_font = pygame.font.SysFont(None, TRAIN_FONT_SIZE)
     status_font = pygame.font.SysFont(None, STATUS_FONT_SIZE)
+boot_clock = boot_mark("fonts", boot_clock)
+
+# Splash: on screen while the network comes up in the background
+def draw_splash():
+    splash = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+    splash.fill(BLACK)
+    title = station_font.render("Departure board", True, ORANGE)
+    status = train_font.render("Connecting to National Rail...", True, ORANGE)
+    clock_text = clock_font.render(datetime.now().strftime("%H:%M:%S"), True, ORANGE)
+    splash.blit(title, ((WINDOW_WIDTH - title.get_width()) // 2, 20))
+    splash.blit(status, ((WINDOW_WIDTH - status.get_width()) // 2, (WINDOW_HEIGHT - status.get_height()) // 2))
+    splash.blit(clock_text, ((WINDOW_WIDTH - clock_text.get_width()) // 2, WINDOW_HEIGHT - clock_text.get_height() - 20))
+    if ROTATE_DISPLAY:
+        splash = pygame.transform.rotate(splash, 180)
+    screen.blit(splash, (0, 0))
+    pygame.display.flip()
+
+draw_splash()
+boot_clock = boot_mark("splash", boot_clock)
+threading.Thread(target=init_network, name="network-init", daemon=True).start()
 
 # === Scrolling Text class ===
 class ScrollingText:
@@ -189,7 +253,11 @@ def fetch_departures(station_code, target_platforms):
         last_service_details_cleanup = time.time()
 
     try:
-        response = soap_client.service.GetDepartureBoard(40, station_code, _soapheaders=[soap_header_value])
+        if USE_BOARD_WITH_DETAILS:
+            # Calling points come back inline, so this is the only request for the station
+            response = soap_client.service.GetDepBoardWithDetails(DETAILS_BOARD_MAX_ROWS, station_code, _soapheaders=[soap_header_value])
+        else:
+            response = soap_client.service.GetDepartureBoard(40, station_code, _soapheaders=[soap_header_value])
         if not hasattr(response, 'trainServices') or not response.trainServices:
             return {p:[] for p in target_platforms}
         
@@ -209,7 +277,9 @@ def fetch_departures(station_code, target_platforms):
 
             service_id = service.serviceID
             if len(services_by_platform[platform]) == 0:
-                if service_id in service_details_cache:
+                if USE_BOARD_WITH_DETAILS:
+                    details = service
+                elif service_id in service_details_cache:
                     details = service_details_cache[service_id]
                 else:
                     try:
@@ -302,6 +372,7 @@ def get_temperature(lat, lon):
         if lat is None or lon is None:
             return "N/A"
         url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current_weather=true"
+        import requests  # deferred with the other network modules; cached after the first call
         r = requests.get(url, timeout=5)
         data = r.json()
         if "current_weather" in data and "temperature" in data["current_weather"]:
@@ -316,6 +387,11 @@ def main():
     static_text = []
     scrolling_texts = []
     static_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+    # Every page of the current station with departures, composed once per refresh as
+    # (surface, scrolling_texts); a page flip just switches which one is drawn.
+    # page_surfaces are kept and recomposed so refreshes don't allocate.
+    composed_pages = []
+    page_surfaces = []
     last_update_time = 0
     last_temp_update = 0
 
@@ -335,7 +411,12 @@ def main():
     current_temp = allTemp.get(STATION_CODE, "N/A")
     all_platforms = [str(p) for p in current_station.get("PLATFORMS", [])]
     platform_pages = list(get_paginated_platforms(all_platforms, PLATFORMS_PER_SCREEN))
-    current_targets = platform_pages[0] if platform_pages else []
+    # station the platform lists above belong to; rotation can happen while the SOAP
+    # client is still starting, so this can lag behind STATION_CODE until the next fetch
+    platforms_station = STATION_CODE
+
+    first_frame_logged = False
+    board_logged = False
 
     running = True
     while running:
@@ -345,7 +426,7 @@ def main():
                 running = False
 
         # --- Update temperature every 10 min ---
-        if now - last_temp_update >= 600:
+        if network_ready.is_set() and now - last_temp_update >= 600:
             for code in station_codes:
                 stationForTemp = STATIONS[code]
                 allTemp[code] = get_temperature(stationForTemp.get("LATITUDE"), stationForTemp.get("LONGITUDE"))
@@ -359,22 +440,22 @@ def main():
             last_station_rotate = now
             station_changed = True
 
-        # --- Rotate platform pages ---
-        page_changed = False
-        if len(platform_pages) > 1 and now - last_screen_rotate >= SCREEN_ROTATE_INTERVAL:
-            current_screen_index = (current_screen_index + 1) % len(platform_pages)
+        # --- Rotate platform pages: switch to the next composed page ---
+        if len(composed_pages) > 1 and now - last_screen_rotate >= SCREEN_ROTATE_INTERVAL:
+            current_screen_index = (current_screen_index + 1) % len(composed_pages)
+            static_surface, scrolling_texts = composed_pages[current_screen_index]
             last_screen_rotate = now
-            page_changed = True
 
-        # --- Fetch departures & update display ---
-        if station_changed or page_changed or now - last_update_time >= UPDATE_INTERVAL:
+        # --- Fetch departures & compose every page (once the SOAP client is up) ---
+        if network_ready.is_set() and (station_changed or now - last_update_time >= UPDATE_INTERVAL):
             STATION_CODE = station_codes[station_index]
             current_station = STATIONS[STATION_CODE]
             current_temp = allTemp.get(STATION_CODE, "N/A")
 
-            if station_changed:
+            if STATION_CODE != platforms_station:
                 all_platforms = [str(p) for p in current_station.get("PLATFORMS", [])]
                 platform_pages = list(get_paginated_platforms(all_platforms, PLATFORMS_PER_SCREEN))
+                platforms_station = STATION_CODE
                 current_screen_index = 0
 
             # Safeguard for empty platform_pages
@@ -383,40 +464,36 @@ def main():
                 last_station_rotate = now
                 continue
 
-            # Keep advancing until we find a page with departures or all pages checked
-            page_attempts = 0
-            success = False
-            while page_attempts < len(platform_pages):
-                current_targets = platform_pages[current_screen_index]
-                departures = fetch_departures(STATION_CODE, current_targets)
-
-                success = update_display_multi_platform_with_calling_at(
-                    departures, static_text, scrolling_texts, current_targets
-                )
-
-                if success:
-                    # We found a page with departures — render and break
-                    static_surface.fill(BLACK)
+            # One board request covers every platform page
+            departures = fetch_departures(STATION_CODE, all_platforms)
+            composed_pages = []
+            for targets in platform_pages:
+                page_departures = {platform: departures.get(platform, []) for platform in targets}
+                page_scrolling = []
+                if update_display_multi_platform_with_calling_at(page_departures, static_text, page_scrolling, targets):
+                    if len(page_surfaces) <= len(composed_pages):
+                        page_surfaces.append(pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert())
+                    page_surface = page_surfaces[len(composed_pages)]
+                    page_surface.fill(BLACK)
                     for item in static_text:
                         if isinstance(item[0], pygame.Surface):
-                            static_surface.blit(item[0], item[1])
+                            page_surface.blit(item[0], item[1])
                         elif isinstance(item[0], str) and item[0] == "CALLING_AT_LABEL":
-                            static_surface.blit(item[2], item[1])
-                    last_update_time = now
-                    break
-                else:
-                    # Advance to the next page immediately
-                    current_screen_index = (current_screen_index + 1) % len(platform_pages)
-                    page_attempts += 1
+                            page_surface.blit(item[2], item[1])
+                    composed_pages.append((page_surface, page_scrolling))
+            last_update_time = now
 
             # If all pages were empty, skip to next station — but back off to avoid hammering API
-            if not success:
+            if not composed_pages:
+                scrolling_texts = []
                 station_index = (station_index + 1) % len(station_codes)
                 last_station_rotate = now
-                last_update_time = now  # prevent immediate re-fetch
                 time.sleep(NO_DEPARTURES_COOLDOWN)
                 continue
 
+            current_screen_index %= len(composed_pages)
+            static_surface, scrolling_texts = composed_pages[current_screen_index]
+
 
         # --- Draw frame ---
         frame_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
@@ -454,6 +531,12 @@ def main():
 
         screen.blit(frame_surface, (0,0))
         pygame.display.flip()
+        if not first_frame_logged:
+            log_startup("first frame")
+            first_frame_logged = True
+        if not board_logged and last_update_time:
+            log_startup("first board")
+            board_logged = True
         clock.tick(60)
 
     pygame.quit()
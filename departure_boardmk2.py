@@ -1,13 +1,24 @@
+import os
+import time
+# startup timing includes the imports below
+BOOT_START = time.perf_counter()
+# keep pygame's banner off stdout, which may be carrying exported frames
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
 import pygame
-import zeep
 from datetime import datetime
 import json
-import time
 import logging
-import requests
 import sys
 from json import JSONDecodeError
 import math
+import threading
+import random
+import heapq
+import itertools
+import bisect
+from collections import namedtuple, OrderedDict, Counter, deque
+from concurrent.futures import Future
+from contextlib import contextmanager
 
 # === Setup logging ===
 logging.basicConfig(
@@ -16,8 +27,24 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(message)s",
 )
 
+# === Startup timing ===
+# (phase, seconds) in the order phases finish, from the main thread and from
+# init_network(); logged when the first frame and the first board are on screen.
+boot_phases = []
+
+def boot_mark(phase, started):
+    now = time.perf_counter()
+    boot_phases.append((phase, now - started))
+    return now
+
+def log_startup(milestone):
+    phases = ", ".join(f"{phase} {1000 * seconds:.0f} ms" for phase, seconds in boot_phases)
+    logging.info(f"Startup: {milestone} at {1000 * (time.perf_counter() - BOOT_START):.0f} ms ({phases})")
+
+boot_clock = boot_mark("imports", BOOT_START)
+
 # === Load configuration safely ===
-CONFIG_PATH = "configmk2.json"
+CONFIG_PATH = os.environ.get("DEPARTURE_BOARD_CONFIG", "configmk2.json")
 SAMPLE_CONFIG = {
     "API_KEY": "YOUR_API_KEY_HERE",
     "STATIONS": {
@@ -81,42 +108,275 @@ STATUS_FONT_SIZE = config.get("STATUS_FONT_SIZE", 50)
 WINDOW_WIDTH = config.get("WINDOW_WIDTH", 800)
 WINDOW_HEIGHT = config.get("WINDOW_HEIGHT", 480)
 FULLSCREEN = config.get("FULLSCREEN", False)
+WSDL_VERSION = config.get("WSDL_VERSION", "2021-11-01")
+WSDL_CACHE_DIR = config.get("WSDL_CACHE_DIR", "wsdl_cache")
+SOAP_TRANSPORT = config.get("SOAP_TRANSPORT", "live")
+SOAP_RECORDING_DIR = config.get("SOAP_RECORDING_DIR", "recordings")
+REPLAY_LATENCY = config.get("REPLAY_LATENCY", 0.15)
+REPLAY_JITTER = config.get("REPLAY_JITTER", 0.05)
+REPLAY_ERROR_RATE = config.get("REPLAY_ERROR_RATE", 0.0)
+REPLAY_TIMEOUT_RATE = config.get("REPLAY_TIMEOUT_RATE", 0.0)
+REPLAY_TIMEOUT = config.get("REPLAY_TIMEOUT", 5.0)
+REPLAY_SEED = config.get("REPLAY_SEED")
 NSERVICE = config.get("NSERVICE", 6)
 TRAINSPERSCREEN = config.get("TRAINSPERSCREEN", 10)
+DETAILS_WORKERS = config.get("DETAILS_WORKERS", 4)
+# older configs only limited GetServiceDetails; that value now becomes the shared limit
+DETAILS_REQUESTS_PER_SECOND = config.get("DETAILS_REQUESTS_PER_SECOND", 5)
+# every LDBWS request (boards and details) shares one token bucket sized to the access token's limit
+LDBWS_REQUESTS_PER_SECOND = config.get("LDBWS_REQUESTS_PER_SECOND", DETAILS_REQUESTS_PER_SECOND)
+LDBWS_BURST = config.get("LDBWS_BURST", 5)
+SERVICE_DETAILS_TTL = config.get("SERVICE_DETAILS_TTL", 600)
+SERVICE_DETAILS_CACHE_SIZE = config.get("SERVICE_DETAILS_CACHE_SIZE", 500)
+USE_BOARD_WITH_DETAILS = config.get("USE_BOARD_WITH_DETAILS", False)
+# LDBWS returns at most 10 services from the with-details board calls
+DETAILS_BOARD_MAX_ROWS = 10
+TEXT_CACHE_SIZE = config.get("TEXT_CACHE_SIZE", 256)
+MAX_STALE_AGE = config.get("MAX_STALE_AGE", 600)
+FETCH_RETRY_INTERVAL = config.get("FETCH_RETRY_INTERVAL", 15)
+BREAKER_FAILURE_THRESHOLD = config.get("BREAKER_FAILURE_THRESHOLD", 3)
+BREAKER_MAX_DELAY = config.get("BREAKER_MAX_DELAY", 600)
+NO_DEPARTURES_HOLD = config.get("NO_DEPARTURES_HOLD", 10)
+# seconds before a station rotation that the next station is fetched and pre-rendered
+PREFETCH_LEAD = config.get("PREFETCH_LEAD", 10)
+# SCROLL_SPEED was pixels per frame at 60 fps; the time-based default keeps the same pace
+SCROLL_PIXELS_PER_SECOND = config.get("SCROLL_PIXELS_PER_SECOND", SCROLL_SPEED * 60)
+SCROLL_TILE_WIDTH = config.get("SCROLL_TILE_WIDTH", 512)
+SCROLL_FPS = config.get("SCROLL_FPS", 60)
+IDLE_FPS = config.get("IDLE_FPS", 1)
+HEADLESS = config.get("HEADLESS", False)
+UNTHROTTLED = config.get("UNTHROTTLED", False)
+MAX_FRAMES = config.get("MAX_FRAMES", 0)
+FRAME_EXPORT_PATH = config.get("FRAME_EXPORT_PATH")
+FRAME_EXPORT_FORMAT = config.get("FRAME_EXPORT_FORMAT", "png")
+# the details workers and the board fetcher can all be talking to LDBWS at once
+HTTP_POOL_SIZE = config.get("HTTP_POOL_SIZE", DETAILS_WORKERS + 1)
+HTTP_CONNECT_TIMEOUT = config.get("HTTP_CONNECT_TIMEOUT", 5)
+HTTP_READ_TIMEOUT = config.get("HTTP_READ_TIMEOUT", 15)
+WEATHER_READ_TIMEOUT = config.get("WEATHER_READ_TIMEOUT", 5)
+WEATHER_TTL = config.get("WEATHER_TTL", 600)
+# temperatures older than this (e.g. from the disk cache while Open-Meteo is down) show as N/A
+WEATHER_MAX_AGE = config.get("WEATHER_MAX_AGE", 3 * WEATHER_TTL)
+WEATHER_CACHE_PATH = config.get("WEATHER_CACHE_PATH", "weather_cache.json")
+# 2 decimal places is about 1 km; closer stations share one temperature
+WEATHER_COORD_PRECISION = config.get("WEATHER_COORD_PRECISION", 2)
+# "standalone", "server" (also serve boards to other displays) or "client" (show a server's boards)
+BOARD_MODE = config.get("BOARD_MODE", "standalone")
+BOARD_SERVER_HOST = config.get("BOARD_SERVER_HOST", "0.0.0.0")
+BOARD_SERVER_PORT = config.get("BOARD_SERVER_PORT", 8765)
+BOARD_SERVER_URL = config.get("BOARD_SERVER_URL", f"http://localhost:{BOARD_SERVER_PORT}")
+BOARD_CLIENT_POLL_INTERVAL = config.get("BOARD_CLIENT_POLL_INTERVAL", 5)
+# local metrics endpoint (/metrics and /metrics.json); 0 leaves it off
+METRICS_HOST = config.get("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = config.get("METRICS_PORT", 0)
+# seconds between metrics summaries in the log; 0 logs one only at exit
+METRICS_LOG_INTERVAL = config.get("METRICS_LOG_INTERVAL", 300)
+# "" (off), "cprofile" or "sample"
+PROFILE = config.get("PROFILE", "")
+PROFILE_PATH = config.get("PROFILE_PATH", "profile")
+PROFILE_SAMPLE_INTERVAL = config.get("PROFILE_SAMPLE_INTERVAL", 0.01)
+if USE_BOARD_WITH_DETAILS and NSERVICE > DETAILS_BOARD_MAX_ROWS:
+    logging.warning(f"USE_BOARD_WITH_DETAILS limits NSERVICE to {DETAILS_BOARD_MAX_ROWS} (configured {NSERVICE})")
 
 STATIONS = {k: STATIONS[k] for k in SELECT_STATIONS}
+boot_clock = boot_mark("config", boot_clock)
 
-# === Setup SOAP client ===
-WSDL_URL = "https://lite.realtime.nationalrail.co.uk/OpenLDBWS/wsdl.aspx"
+# === Network setup ===
+# zeep, requests and the SOAP client (which may have to download the WSDL) are set up
+# by init_network() on a background thread once the splash is up, so a cold start
+# shows something straight away. network_ready is set when it finishes, whether or not
+# it succeeded; everything that touches the network waits for it.
+WSDL_URL = f"https://lite.realtime.nationalrail.co.uk/OpenLDBWS/wsdl.aspx?ver={WSDL_VERSION}"
+http_sessions = None
+soap_transport = None
 soap_client = None
 soap_header_value = None
-try:
-    soap_client = zeep.Client(wsdl=WSDL_URL)
-    header = zeep.xsd.Element(
-        "{http://thalesgroup.com/RTTI/2013-11-28/Token/types}AccessToken",
-        zeep.xsd.ComplexType([zeep.xsd.Element("TokenValue", zeep.xsd.String())]),
-    )
-    soap_header_value = header(TokenValue=API_KEY)
-except Exception as e:
-    logging.error(f"SOAP client init failed: {e}")
-    TEST_MODE = True
+network_ready = threading.Event()
+
+def init_network():
+    global http_sessions, soap_transport, soap_client, soap_header_value, TEST_MODE
+    started = time.perf_counter()
+    try:
+        import zeep
+        from soap_transport import CachingTransport, RecordReplayTransport, SessionPool
+        started = boot_mark("network imports", started)
+
+        # Keep-alive connections per host, shared by the SOAP client and the weather lookups
+        http_sessions = SessionPool(HTTP_POOL_SIZE)
+
+        # TEST_MODE never talks to LDBWS, so it also starts without the network;
+        # a client display gets everything from the board server
+        if TEST_MODE or BOARD_MODE == "client":
+            return
+        try:
+            # WSDL and XSDs come from the local cache when present and are revalidated in the background
+            transport_options = dict(
+                session=http_sessions.session(WSDL_URL),
+                timeout=HTTP_READ_TIMEOUT,
+                operation_timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT),
+            )
+            if SOAP_TRANSPORT in ("record", "replay"):
+                soap_transport = RecordReplayTransport(
+                    SOAP_RECORDING_DIR, WSDL_VERSION, mode=SOAP_TRANSPORT,
+                    latency=REPLAY_LATENCY, jitter=REPLAY_JITTER, error_rate=REPLAY_ERROR_RATE,
+                    timeout_rate=REPLAY_TIMEOUT_RATE, timeout_after=REPLAY_TIMEOUT, seed=REPLAY_SEED,
+                    **transport_options,
+                )
+            else:
+                soap_transport = CachingTransport(WSDL_CACHE_DIR, WSDL_VERSION, **transport_options)
+            client = zeep.Client(wsdl=WSDL_URL, transport=soap_transport)
+            if soap_transport.served_from_cache and SOAP_TRANSPORT != "replay":
+                threading.Thread(target=soap_transport.revalidate, name="wsdl-revalidate", daemon=True).start()
+            header = zeep.xsd.Element(
+                "{http://thalesgroup.com/RTTI/2013-11-28/Token/types}AccessToken",
+                zeep.xsd.ComplexType([zeep.xsd.Element("TokenValue", zeep.xsd.String())]),
+            )
+            soap_header_value = header(TokenValue=API_KEY)
+            soap_client = client
+        except Exception as e:
+            logging.error(f"SOAP client init failed: {e}")
+            TEST_MODE = True
+        boot_mark("SOAP client", started)
+    except ImportError as e:
+        logging.error(f"Network modules unavailable, running in test mode: {e}")
+        TEST_MODE = True
+    finally:
+        network_ready.set()
+
+# === Departure records ===
+# Built once when a board is parsed, so nothing downstream holds on to zeep objects.
+# namedtuples carry no per-instance __dict__, and a Departure still unpacks like the
+# plain 6-tuples the renderer, the board server and the benchmarks pass around.
+Departure = namedtuple("Departure", ["time", "destination", "platform", "calling_at", "status", "operator"])
+CallingPoint = namedtuple("CallingPoint", ["name", "time"])
+
+# Works on both GetServiceDetails responses and with-details board services. Names and
+# times repeat across services and stations, so they are interned.
+def parse_calling_points(details):
+    if details and hasattr(details,'subsequentCallingPoints') and details.subsequentCallingPoints:
+        point_lists = details.subsequentCallingPoints.callingPointList
+        if isinstance(point_lists, list) and point_lists:
+            return tuple(
+                CallingPoint(sys.intern(str(cp.locationName)), sys.intern(str(cp.st)))
+                for cp in point_lists[0].callingPoint if hasattr(cp, "locationName")
+            )
+    return ()
+
+def format_calling_points(points):
+    return ", ".join(f"{point.name} ({point.time})" for point in points)
+
+# Bytes held by nested tuples, lists, dicts and strings, counting shared objects once per seen set
+def deep_sizeof(obj, seen=None):
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (tuple, list, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
 
 # === Service details cache ===
-service_details_cache = {}
-SERVICE_DETAILS_TTL = 600
-last_service_details_cleanup = time.time()
+# Per-entry expiry with an LRU size cap. Entries are also dropped as soon as a service
+# leaves the board of every station that listed it. Locked because the details workers write to it.
+# Each entry lives a random share of the TTL (between 1 - jitter and 1), so a board's
+# worth of details fetched in one refresh doesn't all come due again in one refresh.
+class ServiceDetailsCache:
+    def __init__(self, ttl, max_entries, jitter=0.25):
+        self.ttl = ttl
+        self.jitter = jitter
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # service_id -> (expires_at, tuple of CallingPoint)
+        self.board_ids = {}  # station_code -> service ids on its last board
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _live_entry(self, service_id, now):
+        entry = self.entries.get(service_id)
+        if entry is not None and entry[0] <= now:
+            del self.entries[service_id]
+            self.evictions += 1
+            return None
+        return entry
+
+    def get(self, service_id):
+        with self.lock:
+            entry = self._live_entry(service_id, time.time())
+            if entry is None:
+                return None
+            self.entries.move_to_end(service_id)
+            return entry[1]
+
+    def put(self, service_id, details):
+        with self.lock:
+            self.entries[service_id] = (time.time() + self.ttl * random.uniform(1 - self.jitter, 1.0), details)
+            self.entries.move_to_end(service_id)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    # Returns the ids that need fetching; this is where hits and misses are counted
+    def missing(self, service_ids):
+        now = time.time()
+        missing = []
+        with self.lock:
+            for service_id in dict.fromkeys(service_ids):
+                if self._live_entry(service_id, now) is None:
+                    self.misses += 1
+                    missing.append(service_id)
+                else:
+                    self.hits += 1
+        return missing
+
+    # Record the ids on a station's latest board and drop details for services that left it
+    def retain(self, station_code, service_ids):
+        with self.lock:
+            previous = self.board_ids.get(station_code, set())
+            self.board_ids[station_code] = set(service_ids)
+            still_listed = set().union(*self.board_ids.values())
+            for service_id in previous - still_listed:
+                if self.entries.pop(service_id, None) is not None:
+                    self.evictions += 1
+
+    # Memory held for the services on one station's board
+    def station_bytes(self, station_code):
+        with self.lock:
+            points = [self.entries[sid][1] for sid in self.board_ids.get(station_code, ()) if sid in self.entries]
+        return deep_sizeof(points) - sys.getsizeof(points)
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+service_details_cache = ServiceDetailsCache(SERVICE_DETAILS_TTL, SERVICE_DETAILS_CACHE_SIZE)
 
 # === Pygame setup ===
+if HEADLESS:
+    # Render into an offscreen surface; no monitor or window system needed
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
 pygame.mixer.pre_init(0,0,0,0)
 pygame.init()
 pygame.mixer.quit()
 
-if FULLSCREEN:
+if FULLSCREEN and not HEADLESS:
     screen = pygame.display.set_mode((0,0), pygame.FULLSCREEN)
 else:
     screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
 
 WINDOW_WIDTH, WINDOW_HEIGHT = screen.get_size()
+boot_clock = boot_mark("display", boot_clock)
 
 BLACK = (0,0,0)
 ORANGE = (255,165,0)
@@ -135,113 +395,799 @@ except:
     platform_font = pygame.font.SysFont(None, PLATFORM_FONT_SIZE)
     train_font = pygame.font.SysFont(None, TRAIN_FONT_SIZE)
     status_font = pygame.font.SysFont(None, STATUS_FONT_SIZE)
+boot_clock = boot_mark("fonts", boot_clock)
+
+# Splash: on screen while the network comes up in the background
+def draw_splash():
+    splash = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+    splash.fill(BLACK)
+    title = station_font.render("Departure board", True, ORANGE)
+    status = train_font.render("Connecting to National Rail...", True, ORANGE)
+    clock_text = clock_font.render(datetime.now().strftime("%H:%M:%S"), True, ORANGE)
+    splash.blit(title, ((WINDOW_WIDTH - title.get_width()) // 2, 20))
+    splash.blit(status, ((WINDOW_WIDTH - status.get_width()) // 2, (WINDOW_HEIGHT - status.get_height()) // 2))
+    splash.blit(clock_text, ((WINDOW_WIDTH - clock_text.get_width()) // 2, WINDOW_HEIGHT - clock_text.get_height() - 20))
+    if ROTATE_DISPLAY:
+        splash = pygame.transform.rotate(splash, 180)
+    screen.blit(splash, (0, 0))
+    pygame.display.flip()
+
+draw_splash()
+boot_clock = boot_mark("splash", boot_clock)
+threading.Thread(target=init_network, name="network-init", daemon=True).start()
+
+# === Text rendering cache ===
+# One atlas per font and colour: each character is rasterised once and strings are
+# composed by blitting the cached glyphs side by side.
+class GlyphAtlas:
+    def __init__(self, font, colour):
+        self.font = font
+        self.colour = colour
+        self.height = font.get_height()
+        self.glyphs = {}
+
+    def glyph(self, char):
+        glyph = self.glyphs.get(char)
+        if glyph is None:
+            glyph = self.font.render(char, True, self.colour)
+            self.glyphs[char] = glyph
+        return glyph
+
+    def compose(self, text):
+        glyphs = [self.glyph(char) for char in text]
+        surface = pygame.Surface((sum(g.get_width() for g in glyphs), self.height), pygame.SRCALPHA)
+        x = 0
+        for glyph in glyphs:
+            # MAX keeps each glyph's own colour and coverage on the transparent surface
+            surface.blit(glyph, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            x += glyph.get_width()
+        return surface
+
+# LRU of composed strings keyed by (font, text, colour). Text that repeats frame after
+# frame (clock, temperature, station name) costs a dict lookup once it is cached.
+class TextCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.atlases = {}
+        self.hits = 0
+        self.misses = 0
+
+    def atlas(self, font, colour):
+        atlas = self.atlases.get((font, colour))
+        if atlas is None:
+            atlas = self.atlases[(font, colour)] = GlyphAtlas(font, colour)
+        return atlas
+
+    def render(self, font, text, colour):
+        key = (font, text, colour)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.atlas(font, colour).compose(text)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return round(self.hits / lookups, 3) if lookups else 0.0
+
+text_cache = TextCache(TEXT_CACHE_SIZE)
 
 # === Scrolling Text class ===
+# Scrolls at SCROLL_PIXELS_PER_SECOND whatever the frame rate. The text is laid out as
+# fixed-width tiles up front, but only the tiles currently inside the clip rect are
+# composed and kept, so a long calling-point list never becomes one huge surface.
 class ScrollingText:
     def __init__(self, y_pos, text, label_surface, x_margin=10, gap=SCROLL_GAP):
         self.text = text
-        rendered_text = train_font.render(self.text, True, ORANGE)
-        self.text_width = rendered_text.get_width()
-        self.surface = pygame.Surface((self.text_width, train_font.get_height()), pygame.SRCALPHA)
-        self.surface.blit(rendered_text, (0,0))
+        self.atlas = text_cache.atlas(train_font, ORANGE)
+        self.tiles = []  # (x offset, width, characters)
+        self.text_width = 0
+        start = 0
+        tile_width = 0
+        for i, char in enumerate(text):
+            char_width = self.atlas.glyph(char).get_width()
+            if tile_width and tile_width + char_width > SCROLL_TILE_WIDTH:
+                self.tiles.append((self.text_width, tile_width, text[start:i]))
+                self.text_width += tile_width
+                start = i
+                tile_width = 0
+            tile_width += char_width
+        if tile_width:
+            self.tiles.append((self.text_width, tile_width, text[start:]))
+            self.text_width += tile_width
+        self.tile_surfaces = {}
         self.y_pos = y_pos
         self.x_start = label_surface.get_width() + x_margin
         self.x_pos = self.x_start
-        self.speed = SCROLL_SPEED
+        self.speed = SCROLL_PIXELS_PER_SECOND
         self.gap = gap
         self.clip_width = WINDOW_WIDTH - self.x_start - 20
+        self.last_update = None
 
-    def update(self):
-        self.x_pos -= self.speed
-        if self.x_pos < self.x_start - self.text_width - self.gap:
-            self.x_pos += self.text_width + self.gap
+    def update(self, now=None):
+        now = time.monotonic() if now is None else now
+        if self.last_update is not None:
+            period = self.text_width + self.gap
+            travelled = self.x_start - self.x_pos + self.speed * (now - self.last_update)
+            self.x_pos = self.x_start - travelled % period
+        self.last_update = now
 
     def draw(self, surface, clip_rect=None):
         if clip_rect:
             surface.set_clip(clip_rect)
-        surface.blit(self.surface, (self.x_pos, self.y_pos))
-        surface.blit(self.surface, (self.x_pos + self.text_width + self.gap, self.y_pos))
+        view = surface.get_clip()
+        visible = {}
+        for copy_x in (self.x_pos, self.x_pos + self.text_width + self.gap):
+            for index, (tile_x, tile_width, chars) in enumerate(self.tiles):
+                x = round(copy_x + tile_x)
+                if x >= view.right or x + tile_width <= view.left:
+                    continue
+                tile = visible.get(index) or self.tile_surfaces.get(index)
+                if tile is None:
+                    tile = self.atlas.compose(chars)
+                visible[index] = tile
+                surface.blit(tile, (x, self.y_pos))
+        # tiles that scrolled out of view are dropped
+        self.tile_surfaces = visible
         surface.set_clip(None)
 
 # === Helpers ===
-# Produce a list of lists with platform numbers to be shown on each page
+# Split a list into pages of per_page items (platform numbers or departures)
 def get_paginated_platforms(platforms, per_page):
     for i in range(0, len(platforms), per_page):
         yield platforms[i:i+per_page]
 
-# returns a list of nService services for the station_code (sliced by page)
-def fetch_departures(station_code, current_screen_index):
-    global last_service_details_cleanup, service_details_cache
+# === Metrics ===
+# Latency histograms and counters for the fetch and render paths, cheap enough to stay
+# on. The point-in-time figures (data age per station, cache hit rates, the LDBWS
+# queue) are read when a report is made. Reports are served by MetricsServer and
+# logged every METRICS_LOG_INTERVAL seconds.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+FRAME_PHASES = ("update", "scroll", "overlay", "present")
+
+class Histogram:
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # the last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    # Upper bound of the bucket the q-th quantile falls in
+    def quantile(self, q):
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen and seen >= q * self.count:
+                return min(bound, self.max)
+        return self.max
+
+def format_labels(labels):
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}" if labels else ""
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}  # (name, labels) -> Histogram; labels is a sorted tuple of (key, value)
+        self.counters = {}
+        self.sent = deque()  # monotonic times of LDBWS requests in the last minute
+        self.frame_rate = 0  # the frame rate FrameScheduler chose last
+        # the frame loop's histograms are looked up once rather than every frame
+        self.frame = self._histogram("frame_seconds", ())
+        self.phases = [self._histogram("render_phase_seconds", (("phase", phase),)) for phase in FRAME_PHASES]
+
+    def _histogram(self, name, labels):
+        histogram = self.histograms.get((name, labels))
+        if histogram is None:
+            histogram = self.histograms[(name, labels)] = Histogram()
+        return histogram
+
+    def observe(self, name, seconds, **labels):
+        with self.lock:
+            self._histogram(name, tuple(sorted(labels.items()))).observe(seconds)
+
+    def observe_frame(self, seconds, phase_seconds):
+        with self.lock:
+            self.frame.observe(seconds)
+            for histogram, value in zip(self.phases, phase_seconds):
+                histogram.observe(value)
+
+    def inc(self, name, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + 1
+
+    def request_sent(self):
+        with self.lock:
+            self.sent.append(time.monotonic())
 
-    # Cleanup old cache entries periodically
-    if time.time() - last_service_details_cleanup > SERVICE_DETAILS_TTL:
-        service_details_cache = {}
-        last_service_details_cleanup = time.time()
+    def requests_per_minute(self):
+        cutoff = time.monotonic() - 60
+        with self.lock:
+            while self.sent and self.sent[0] < cutoff:
+                self.sent.popleft()
+            return len(self.sent)
 
+    # Figures read at report time, as (name, labels, value)
+    def gauges(self, fetcher):
+        now = time.time()
+        gauges = [("requests_per_minute", (), self.requests_per_minute()), ("frame_rate_fps", (), self.frame_rate)]
+        for code, snapshot in sorted(fetcher.snapshots.items()):
+            if snapshot.fetched_at:
+                gauges.append(("data_age_seconds", (("station", code),), round(now - snapshot.fetched_at, 1)))
+        gauges.append(("cache_hit_ratio", (("cache", "service_details"),), service_details_cache.stats()["hit_rate"]))
+        gauges.append(("cache_hit_ratio", (("cache", "text"),), text_cache.hit_rate()))
+        for stat, value in ldbws_scheduler.stats().items():
+            gauges.append(("ldbws_scheduler", (("stat", stat),), value))
+        return gauges
+
+    def report(self, fetcher):
+        with self.lock:
+            histograms = [
+                {
+                    "name": name, "labels": dict(labels), "count": h.count,
+                    "mean_ms": round(1000 * h.sum / h.count, 2),
+                    "p50_ms": round(1000 * h.quantile(0.5), 2),
+                    "p95_ms": round(1000 * h.quantile(0.95), 2),
+                    "max_ms": round(1000 * h.max, 2),
+                }
+                for (name, labels), h in sorted(self.histograms.items()) if h.count
+            ]
+            counters = [{"name": name, "labels": dict(labels), "value": value} for (name, labels), value in sorted(self.counters.items())]
+        gauges = [{"name": name, "labels": dict(labels), "value": value} for name, labels, value in self.gauges(fetcher)]
+        return {"histograms": histograms, "counters": counters, "gauges": gauges}
+
+    # Prometheus text exposition format
+    def prometheus(self, fetcher):
+        lines = []
+        typed = set()
+        def declare(name, kind):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+        with self.lock:
+            for (name, labels), h in sorted(self.histograms.items()):
+                name = f"departure_board_{name}"
+                declare(name, "histogram")
+                cumulative = 0
+                for bound, count in zip(h.bounds + ("+Inf",), h.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{format_labels(labels + (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_sum{format_labels(labels)} {h.sum:.6f}")
+                lines.append(f"{name}_count{format_labels(labels)} {h.count}")
+            for (name, labels), value in sorted(self.counters.items()):
+                name = f"departure_board_{name}_total"
+                declare(name, "counter")
+                lines.append(f"{name}{format_labels(labels)} {value}")
+        for name, labels, value in self.gauges(fetcher):
+            name = f"departure_board_{name}"
+            declare(name, "gauge")
+            lines.append(f"{name}{format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    # One line for the log: latency percentiles, then the gauges
+    def summary(self, fetcher):
+        report = self.report(fetcher)
+        parts = [
+            f"{h['name']}{format_labels(tuple(h['labels'].items()))} n={h['count']} p50={h['p50_ms']}ms p95={h['p95_ms']}ms max={h['max_ms']}ms"
+            for h in report["histograms"]
+        ]
+        parts += [f"{c['name']}{format_labels(tuple(c['labels'].items()))}={c['value']}" for c in report["counters"]]
+        parts += [f"{g['name']}{format_labels(tuple(g['labels'].items()))}={g['value']}" for g in report["gauges"]]
+        return "; ".join(parts)
+
+metrics = Metrics()
+
+# Serves /metrics (Prometheus text) and /metrics.json on METRICS_HOST:METRICS_PORT
+class MetricsServer(threading.Thread):
+    def __init__(self, host, port, fetcher):
+        super().__init__(name="metrics-server", daemon=True)
+        self.fetcher = fetcher
+        # deferred like the board server's, so displays without METRICS_PORT never load it
+        from http.server import ThreadingHTTPServer
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+
+    def _handler(self):
+        from http.server import BaseHTTPRequestHandler
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body = metrics.prometheus(server.fetcher).encode("utf-8")
+                    content_type = "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body = json.dumps(metrics.report(server.fetcher)).encode("utf-8")
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logging.debug(f"Metrics server {self.address_string()}: {format % args}")
+
+        return Handler
+
+    def run(self):
+        logging.info(f"Metrics server listening on {self.httpd.server_address[0]}:{self.httpd.server_address[1]}")
+        self.httpd.serve_forever()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+# === Profiling ===
+# Opt-in with PROFILE, for finding hot spots on the real hardware.
+# "cprofile": the render loop and every board refresh and LDBWS request run under
+#   cProfile, written on exit to render.prof and fetch.prof in PROFILE_PATH (read with
+#   python -m pstats). On Python 3.12+ cProfile sits on sys.monitoring: only one
+#   profile can be active per process and it sees every thread, so there a single
+#   profile started by the render loop covers the whole process (process.prof) and
+#   fetches are not profiled separately.
+# "sample": every thread's stack is recorded each PROFILE_SAMPLE_INTERVAL seconds and
+#   written on exit as folded stacks (samples.folded, for flamegraph.pl or speedscope).
+#   Much lighter than cProfile, so it can be left running for a while.
+CPROFILE_PROCESS_WIDE = sys.version_info >= (3, 12)
+
+class Profiler:
+    def __init__(self, mode, path, interval):
+        self.mode = mode
+        self.path = path
+        self.interval = interval
+        self.process_wide = mode == "cprofile" and CPROFILE_PROCESS_WIDE
+        self.render = None
+        self.fetch_stats = None
+        self.samples = Counter()
+        self.lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._sampler = None
+
+    # Call from the render thread: its profile covers everything until close()
+    def start(self):
+        if self.mode == "cprofile":
+            import cProfile
+            self.render = cProfile.Profile()
+            self.render.enable()
+            if self.process_wide:
+                logging.info(
+                    f"Profiling with cProfile on Python {sys.version_info.major}.{sys.version_info.minor}: "
+                    "one profile covers every thread (process.prof), board fetching is not profiled "
+                    "on its own; use PROFILE sample to separate the threads"
+                )
+        elif self.mode == "sample":
+            self._sampler = threading.Thread(target=self._sample, name="profiler", daemon=True)
+            self._sampler.start()
+
+    @contextmanager
+    def fetch(self):
+        if self.mode != "cprofile" or self.process_wide:
+            yield
+            return
+        import cProfile
+        import pstats
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self.lock:
+                if self.fetch_stats is None:
+                    self.fetch_stats = pstats.Stats(profile)
+                else:
+                    self.fetch_stats.add(profile)
+
+    def _sample(self):
+        own = threading.get_ident()
+        while not self._stopping.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def close(self):
+        if self.mode not in ("cprofile", "sample"):
+            return
+        os.makedirs(self.path, exist_ok=True)
+        if self.render is not None:
+            self.render.disable()
+            self.render.dump_stats(os.path.join(self.path, "process.prof" if self.process_wide else "render.prof"))
+        with self.lock:
+            if self.fetch_stats is not None:
+                self.fetch_stats.dump_stats(os.path.join(self.path, "fetch.prof"))
+        if self._sampler is not None:
+            self._stopping.set()
+            self._sampler.join()
+            with open(os.path.join(self.path, "samples.folded"), "w") as f:
+                for stack, count in self.samples.most_common():
+                    f.write(f"{stack} {count}\n")
+        logging.info(f"Profile written to {os.path.abspath(self.path)}")
+
+profiler = Profiler(PROFILE, PROFILE_PATH, PROFILE_SAMPLE_INTERVAL)
+
+# === Circuit breaker ===
+# Counts consecutive failures per key. From the threshold-th failure on, the circuit is
+# open: calls for that key are skipped until a backoff expires. The backoff doubles
+# with every further failure (capped at max_delay) and is jittered so stations and
+# screens don't retry in lockstep. After the backoff the circuit is half-open: the first
+# allow() takes the one trial call and holds everyone else off for trial_timeout while
+# it runs. Success closes the circuit again; failure reopens it with a longer backoff.
+class CircuitBreaker:
+    def __init__(self, name, threshold, base_delay, max_delay, trial_timeout=None):
+        self.name = name
+        self.threshold = threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.trial_timeout = base_delay if trial_timeout is None else trial_timeout
+        self.failures = {}
+        self.open_until = {}
+        self.lock = threading.Lock()
+
+    # For a caller about to make the call: False while open, True once for the trial
+    def allow(self, key):
+        with self.lock:
+            open_until = self.open_until.get(key)
+            if open_until is None:
+                return True
+            now = time.time()
+            if now < open_until:
+                return False
+            self.open_until[key] = now + self.trial_timeout
+            return True
+
+    # State check that doesn't take the trial
+    def is_open(self, key):
+        return time.time() < self.open_until.get(key, 0)
+
+    def retry_at(self, key):
+        return self.open_until.get(key, 0)
+
+    # Forget every key's failures and close all circuits
+    def reset(self):
+        with self.lock:
+            self.failures.clear()
+            self.open_until.clear()
+
+    def record_success(self, key):
+        with self.lock:
+            if self.failures.pop(key, 0) >= self.threshold:
+                logging.info(f"{self.name} circuit closed for {key}")
+            self.open_until.pop(key, None)
+
+    def record_failure(self, key):
+        with self.lock:
+            failures = self.failures.get(key, 0) + 1
+            self.failures[key] = failures
+            if failures < self.threshold:
+                return
+            delay = min(self.max_delay, self.base_delay * 2 ** (failures - self.threshold))
+            delay = random.uniform(delay / 2, delay)
+            self.open_until[key] = time.time() + delay
+        logging.warning(f"{self.name} circuit open for {key} after {failures} failure(s); retry in {delay:.0f}s")
+
+# Shared by board and details calls: a 503 storm stops all LDBWS traffic for a while.
+# A trial is given up on once a request would have timed out.
+ldbws_breaker = CircuitBreaker("LDBWS", BREAKER_FAILURE_THRESHOLD, FETCH_RETRY_INTERVAL, BREAKER_MAX_DELAY,
+                               trial_timeout=HTTP_CONNECT_TIMEOUT + HTTP_READ_TIMEOUT)
+# Per station: one failing board backs off without holding up the others
+station_breaker = CircuitBreaker("Station", 1, FETCH_RETRY_INTERVAL, BREAKER_MAX_DELAY)
+LDBWS_ENDPOINT = "ldbws"
+
+# === LDBWS request scheduler ===
+# Every LDBWS request goes through one scheduler. A token bucket keeps the total rate
+# within the access token's limit (LDBWS_REQUESTS_PER_SECOND, bursts of LDBWS_BURST),
+# and when requests queue up the most urgent is sent first: the station on screen,
+# then the one rotating in next, then everything else. A request for something already
+# queued or in flight (same key) shares that request's result instead of making another.
+PRIORITY_DISPLAYED, PRIORITY_NEXT, PRIORITY_BACKGROUND = 0, 1, 2
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    # Seconds until a token is available; 0 means take() will succeed now
+    def delay(self):
+        if not self.rate:
+            return 0.0
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        if self.rate:
+            self.tokens -= 1
+
+class ScheduledRequest:
+    def __init__(self, key, priority, fn, args):
+        self.key = key
+        self.priority = priority
+        self.fn = fn
+        self.args = args
+        self.future = Future()
+        self.started = False
+
+class RequestScheduler:
+    def __init__(self, rate, burst, workers):
+        self.bucket = TokenBucket(rate, burst)
+        self.cond = threading.Condition()
+        self.queue = []  # heap of (priority, seq, request); promoted requests leave stale entries behind
+        self.pending = {}  # key -> ScheduledRequest, queued or in flight
+        self.queued = 0
+        self.seq = itertools.count()
+        self.sent = [0, 0, 0]  # requests sent, by priority
+        self.coalesced = 0
+        self.workers = [
+            threading.Thread(target=self._work, name=f"ldbws-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    # Queue fn(*args) and return a Future for its result
+    def submit(self, key, priority, fn, *args):
+        with self.cond:
+            request = self.pending.get(key)
+            if request is not None:
+                self.coalesced += 1
+                if not request.started and priority < request.priority:
+                    request.priority = priority
+                    heapq.heappush(self.queue, (priority, next(self.seq), request))
+                    self.cond.notify()
+                return request.future
+            request = ScheduledRequest(key, priority, fn, args)
+            self.pending[key] = request
+            self.queued += 1
+            heapq.heappush(self.queue, (priority, next(self.seq), request))
+            self.cond.notify()
+            return request.future
+
+    # Move a queued request up, e.g. when its station comes on screen
+    def promote(self, key, priority):
+        with self.cond:
+            request = self.pending.get(key)
+            if request is not None and not request.started and priority < request.priority:
+                request.priority = priority
+                heapq.heappush(self.queue, (priority, next(self.seq), request))
+                self.cond.notify()
+
+    def _next(self):
+        with self.cond:
+            while True:
+                if not self.queued:
+                    self.cond.wait()
+                    continue
+                delay = self.bucket.delay()
+                if delay > 0:
+                    # a more urgent request may arrive meanwhile; it still goes first
+                    self.cond.wait(delay)
+                    continue
+                priority, _, request = heapq.heappop(self.queue)
+                if request.started or priority != request.priority:
+                    continue
+                request.started = True
+                self.queued -= 1
+                self.bucket.take()
+                self.sent[priority] += 1
+                return request
+
+    def _work(self):
+        while True:
+            request = self._next()
+            try:
+                result = request.fn(*request.args)
+            except BaseException as e:
+                with self.cond:
+                    del self.pending[request.key]
+                request.future.set_exception(e)
+            else:
+                with self.cond:
+                    del self.pending[request.key]
+                request.future.set_result(result)
+
+    def stats(self):
+        with self.cond:
+            return {
+                "queued": self.queued,
+                "in_flight": len(self.pending) - self.queued,
+                "sent_displayed": self.sent[PRIORITY_DISPLAYED],
+                "sent_next": self.sent[PRIORITY_NEXT],
+                "sent_background": self.sent[PRIORITY_BACKGROUND],
+                "coalesced": self.coalesced,
+            }
+
+# one worker per keep-alive connection
+ldbws_scheduler = RequestScheduler(LDBWS_REQUESTS_PER_SECOND, LDBWS_BURST, HTTP_POOL_SIZE)
+
+# === Service details fetcher ===
+# One LDBWS operation, timed per operation: soap_seconds for the whole call,
+# soap_transport_seconds for the HTTP round trip and parse_seconds for the rest (zeep
+# building the envelope and parsing the reply)
+def soap_call(operation, *args):
+    metrics.request_sent()
+    if soap_transport is not None:
+        soap_transport.clear_post_seconds()
+    started = time.perf_counter()
+    try:
+        # runs on an ldbws_scheduler worker, so it is profiled separately from the refresh waiting on it
+        with profiler.fetch():
+            return getattr(soap_client.service, operation)(*args, _soapheaders=[soap_header_value])
+    except Exception:
+        metrics.inc("soap_errors", operation=operation)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.observe("soap_seconds", elapsed, operation=operation)
+        transport_seconds = soap_transport.last_post_seconds() if soap_transport is not None else None
+        if transport_seconds is not None:
+            metrics.observe("soap_transport_seconds", transport_seconds, operation=operation)
+            metrics.observe("parse_seconds", max(0.0, elapsed - transport_seconds), operation=operation)
+
+def fetch_service_details(service_id):
+    if not ldbws_breaker.allow(LDBWS_ENDPOINT):
+        return None
+    try:
+        details = soap_call("GetServiceDetails", service_id)
+    except Exception as e:
+        logging.warning(f"GetServiceDetails failed for {service_id}: {e}")
+        ldbws_breaker.record_failure(LDBWS_ENDPOINT)
+        return None
+    ldbws_breaker.record_success(LDBWS_ENDPOINT)
+    # only the calling points are shown, so only they are kept
+    points = parse_calling_points(details)
+    service_details_cache.put(service_id, points)
+    return points
+
+# Fetch details for every uncached service id in parallel and wait for them all
+def fetch_service_details_batch(service_ids, priority=PRIORITY_DISPLAYED):
+    missing = service_details_cache.missing(service_ids)
+    futures = [ldbws_scheduler.submit(("details", sid), priority, fetch_service_details, sid) for sid in missing]
+    for future in futures:
+        future.result()
+
+def request_board(station_code):
+    if USE_BOARD_WITH_DETAILS:
+        # Calling points come back inline, so this is the only request for the station
+        return soap_call("GetDepBoardWithDetails", min(NSERVICE, DETAILS_BOARD_MAX_ROWS), station_code)
+    return soap_call("GetDepartureBoard", NSERVICE, station_code)
+
+# returns a list of nService services for the station_code (the whole board, paginated by the caller),
+# or None when the board could not be fetched. priority is the station's place in the request queue.
+# Callers check ldbws_breaker first, so they know whether a request was actually made.
+def fetch_departures(station_code, priority=PRIORITY_DISPLAYED):
     try:
         if TEST_MODE or soap_client is None:
             # In test mode we return an empty list (or you could craft test data)
             return []
 
-        response = soap_client.service.GetDepartureBoard(NSERVICE, station_code, _soapheaders=[soap_header_value])
+        response = ldbws_scheduler.submit(("board", station_code), priority, request_board, station_code).result()
+        ldbws_breaker.record_success(LDBWS_ENDPOINT)
         if not hasattr(response, 'trainServices') or not response.trainServices:
+            service_details_cache.retain(station_code, [])
             return []
 
+        board_services = response.trainServices.service
+
+        if not USE_BOARD_WITH_DETAILS:
+            service_details_cache.retain(station_code, [service.serviceID for service in board_services])
+            # Resolve every missing calling-point list for the board in one parallel batch
+            fetch_service_details_batch(
+                (service.serviceID for service in board_services
+                 if getattr(service, "etd", "").strip().lower() != "cancelled"),
+                priority,
+            )
+
+        build_started = time.perf_counter()
         services = []
-        current_train_index = current_screen_index * TRAINSPERSCREEN
-        for service in response.trainServices.service[current_train_index: current_train_index + TRAINSPERSCREEN]:
+        for service in board_services:
             if service.platform:
                 platform = str(service.platform)
             else:
                 platform = "N/A"
-            operator = service.operator
+            operator = sys.intern(service.operator)
 
-            destination = service.destination.location[0].locationName
+            destination = sys.intern(service.destination.location[0].locationName)
             departure_time = getattr(service, "std", "")
             etd = getattr(service, "etd", "").strip().lower()
             status = "On time" if etd == "on time" else f"Exp {etd}" if ":" in etd or etd.startswith("exp") else "Cancelled" if etd == "cancelled" else "Exp unknown"
             calling_at = ""
 
             if status == "Cancelled":
-                calling_at = service.cancelReason
+                calling_at = service.cancelReason or ""
+            elif USE_BOARD_WITH_DETAILS:
+                calling_at = format_calling_points(parse_calling_points(service))
             else:
-                service_id = service.serviceID
-                if service_id in service_details_cache:
-                    details = service_details_cache[service_id]
-                else:
-                    try:
-                        details = soap_client.service.GetServiceDetails(service_id, _soapheaders=[soap_header_value])
-                        service_details_cache[service_id] = details
-                        time.sleep(0.2)
-                    except:
-                        details = None
-
-                if details and hasattr(details,'subsequentCallingPoints') and details.subsequentCallingPoints:
-                    point_lists = details.subsequentCallingPoints.callingPointList
-                    if isinstance(point_lists, list) and point_lists:
-                        points = point_lists[0].callingPoint
-                        calling_at = ", ".join(f"{cp.locationName} ({cp.st})" for cp in points if hasattr(cp,"locationName"))
+                calling_at = format_calling_points(service_details_cache.get(service.serviceID) or ())
 
-            services.append((departure_time, destination, platform, calling_at, status, operator))
+            services.append(Departure(departure_time, destination, platform, calling_at, status, operator))
 
+        metrics.observe("board_build_seconds", time.perf_counter() - build_started)
         return services
     except Exception as e:
         logging.exception(f"GetDepartureBoard failed for {station_code}: {e}")
         print("SOAP ERROR:", e)
-        return []
+        ldbws_breaker.record_failure(LDBWS_ENDPOINT)
+        # None (not []) so callers can keep showing the last good board
+        return None
 
-def update_display_multi_platform_with_calling_at(departures, static_text, scrolling_texts):
+# === Board rows ===
+# Rendered cells for one departure, kept between refreshes. A row is matched to its
+# service by (time, destination, operator): when a refresh brings the service back,
+# only cells whose text changed are rendered again and its calling points carry on
+# scrolling from where they were.
+class BoardRow:
+    def __init__(self):
+        self.cells = {}  # cell name -> (text, colour, surface)
+        self.scrolling = None
+
+    def cell(self, name, font, text, colour):
+        cached = self.cells.get(name)
+        if cached is not None and cached[0] == text and cached[1] == colour:
+            return cached[2]
+        surface = font.render(text, True, colour)
+        self.cells[name] = (text, colour, surface)
+        return surface
+
+def row_key(departure):
+    departure_time, destination, platform, calling_at, status, operator = departure
+    return (departure_time, destination, operator)
+
+# Drop rows for services no longer on the board (any page of it)
+def retain_rows(rows, pages):
+    live = {row_key(departure) for page in pages for departure in page}
+    for key in list(rows):
+        if key not in live:
+            del rows[key]
+
+def update_display_multi_platform_with_calling_at(departures, static_text, scrolling_texts, rows=None):
     static_text.clear()
     scrolling_texts.clear()
     y_pos = station_font.get_height() + 50
+    rows = {} if rows is None else rows
 
     if not departures:
         # No departures on this page
         return False
 
+    used = set()
     for dep in departures:
         departure_time, destination, platform, calling_at, status, operator = dep
         line_y = y_pos
+        key = row_key(dep)
+        # two services that look identical on the board get a row each
+        row = rows.setdefault(key, BoardRow()) if key not in used else BoardRow()
+        used.add(key)
 
         # Column X positions (tweak to taste)
         x_time = 10
@@ -250,213 +1196,904 @@ def update_display_multi_platform_with_calling_at(departures, static_text, scrol
         x_op = 860
 
         # Draw departure time
-        static_text.append((train_font.render(departure_time, True, ORANGE), (x_time, line_y)))
+        static_text.append((row.cell("time", train_font, departure_time, ORANGE), (x_time, line_y)))
 
         # Draw destination
-        static_text.append((train_font.render(destination, True, ORANGE), (x_dest, line_y)))
+        static_text.append((row.cell("destination", train_font, destination, ORANGE), (x_dest, line_y)))
 
         # Draw platform number
         platformNo = f"Plat {platform}"
-        static_text.append((train_font.render(platformNo, True, ORANGE), (x_plat, line_y)))
+        static_text.append((row.cell("platform", train_font, platformNo, ORANGE), (x_plat, line_y)))
 
         operatorp = f"({operator})"
-        static_text.append((train_font.render(operatorp, True, ORANGE), (x_op, line_y)))
+        static_text.append((row.cell("operator", train_font, operatorp, ORANGE), (x_op, line_y)))
 
         color = (255,0,0) if ("Exp" in status or status == "Cancelled") else ORANGE
-        status_surface = status_font.render(status, True, color)
+        status_surface = row.cell("status", status_font, status, color)
         status_x = WINDOW_WIDTH - status_surface.get_width() - 30
         status_y = line_y + (train_font.get_height() - status_surface.get_height()) // 2
         static_text.append((status_surface, (status_x, status_y)))
 
         if calling_at:
             y_pos += train_font.get_height() + 5
-            label_surface = train_font.render("Calling at:", True, ORANGE)
+            label_surface = text_cache.render(train_font, "Calling at:", ORANGE)
             static_text.append(("CALLING_AT_LABEL", (20, y_pos), label_surface))
-            scrolling_texts.append(ScrollingText(y_pos, calling_at, label_surface, x_margin=150, gap=SCROLL_GAP))
+            if row.scrolling is None or row.scrolling.text != calling_at:
+                row.scrolling = ScrollingText(y_pos, calling_at, label_surface, x_margin=150, gap=SCROLL_GAP)
+            # rows above may have gained or lost a line
+            row.scrolling.y_pos = y_pos
+            scrolling_texts.append(row.scrolling)
             y_pos += train_font.get_height() + 5
+        else:
+            row.scrolling = None
 
         y_pos += train_font.get_height() + status_font.get_height() - 40
     y_pos += 10
 
     return True
 
-def get_temperature(lat, lon):
-    try:
-        if lat is None or lon is None:
+# === Station pages ===
+# The pages of one station's board, composed once per data refresh into retained
+# full-screen surfaces, each with its own scrolling texts. Flipping pages swaps which
+# one is shown, with nothing rendered. The next station is composed ahead of its
+# rotation too, but only up to its first page with departures (first_only), to keep
+# memory down on the Pi; its other pages are composed on the frame after the switch.
+# Surfaces are recycled through a pool, so steady state allocates nothing.
+class StationPages:
+    def __init__(self, code, snapshot, rows, surface_pool, first_only=False):
+        self.code = code
+        self.snapshot = snapshot
+        self.rows = rows
+        # per snapshot page: (surface, scrolling_texts), or None when it has no departures or isn't composed yet
+        self.pages = [None] * len(snapshot.pages)
+        self.pending = list(range(len(snapshot.pages)))  # pages not composed yet, in order
+        retain_rows(rows, snapshot.pages)
+        self.compose(surface_pool, 1 if first_only else None)
+
+    # Compose pending pages in order, stopping once limit pages with departures are done
+    def compose(self, surface_pool, limit=None):
+        composed = 0
+        while self.pending and (limit is None or composed < limit):
+            idx = self.pending.pop(0)
+            static_text, scrolling_texts = [], []
+            if update_display_multi_platform_with_calling_at(self.snapshot.pages[idx], static_text, scrolling_texts, self.rows):
+                surface = surface_pool.pop() if surface_pool else pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+                compose_static_surface(surface, static_text)
+                self.pages[idx] = (surface, scrolling_texts)
+                composed += 1
+
+    # Index of the first composed page with departures from start on (wrapping), or None
+    def find_page(self, start):
+        for step in range(len(self.pages)):
+            idx = (start + step) % len(self.pages)
+            if self.pages[idx] is not None:
+                return idx
+        return None
+
+    def release(self, surface_pool):
+        surface_pool.extend(page[0] for page in self.pages if page is not None)
+        self.pages = []
+        self.pending = []
+
+# The station after station_index, skipping stations whose circuit is open and that
+# have nothing recent to show, unless every station is in that state
+def next_station_index(station_codes, station_index, fetcher):
+    for step in range(1, len(station_codes) + 1):
+        candidate = (station_index + step) % len(station_codes)
+        if not fetcher.unavailable(station_codes[candidate]):
+            return candidate
+    return (station_index + 1) % len(station_codes)
+
+# === Weather ===
+# All stations' temperatures come from one Open-Meteo request in a background thread.
+# Stations that round to the same location (WEATHER_COORD_PRECISION decimal places)
+# share a reading. Readings are kept on disk, so a restart within WEATHER_TTL makes
+# no request at all.
+WEATHER_URL = "https://api.open-meteo.com/v1/forecast"
+WEATHER_ENDPOINT = "open-meteo"
+
+def weather_location(station):
+    lat, lon = station.get("LATITUDE"), station.get("LONGITUDE")
+    if lat is None or lon is None:
+        return None
+    return (round(lat, WEATHER_COORD_PRECISION), round(lon, WEATHER_COORD_PRECISION))
+
+# One request for every location; returns their temperatures in the same order
+def fetch_temperatures(locations):
+    params = {
+        "latitude": ",".join(str(lat) for lat, _ in locations),
+        "longitude": ",".join(str(lon) for _, lon in locations),
+        "current_weather": "true",
+    }
+    r = http_sessions.session(WEATHER_URL).get(WEATHER_URL, params=params, timeout=(HTTP_CONNECT_TIMEOUT, WEATHER_READ_TIMEOUT))
+    r.raise_for_status()
+    data = r.json()
+    # a single location comes back as an object, several as a list
+    results = data if isinstance(data, list) else [data]
+    return [result.get("current_weather", {}).get("temperature") for result in results]
+
+class WeatherFetcher(threading.Thread):
+    def __init__(self, stations, cache_path):
+        super().__init__(name="weather-fetcher", daemon=True)
+        self.station_locations = {code: weather_location(station) for code, station in stations.items()}
+        self.locations = sorted({loc for loc in self.station_locations.values() if loc is not None})
+        self.cache_path = cache_path
+        self.readings = {}  # location -> (temperature, fetched_at); replaced, never mutated
+        self.breaker = CircuitBreaker("Weather", 1, FETCH_RETRY_INTERVAL, WEATHER_TTL)
+        self._stopping = threading.Event()
+        self._load()
+
+    def temperature(self, station_code):
+        reading = self.readings.get(self.station_locations.get(station_code))
+        if reading is None or reading[0] is None or time.time() - reading[1] > WEATHER_MAX_AGE:
             return "N/A"
-        url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current_weather=true"
-        r = requests.get(url, timeout=5)
-        data = r.json()
-        if "current_weather" in data and "temperature" in data["current_weather"]:
-            return f"{round(data['current_weather']['temperature'])}°C"
-        return "N/A"
-    except:
-        return "N/A"
+        return f"{round(reading[0])}°C"
+
+    def stop(self):
+        self._stopping.set()
+
+    def _load(self):
+        try:
+            with open(self.cache_path) as f:
+                cached = json.load(f)
+            readings = {(entry["lat"], entry["lon"]): (entry["temperature"], entry["fetched_at"]) for entry in cached}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logging.warning(f"Ignoring weather cache {self.cache_path}: {e}")
+            return
+        self.readings = {loc: reading for loc, reading in readings.items() if loc in self.locations}
+
+    def _save(self):
+        entries = [
+            {"lat": lat, "lon": lon, "temperature": temperature, "fetched_at": fetched_at}
+            for (lat, lon), (temperature, fetched_at) in self.readings.items()
+        ]
+        tmp_path = self.cache_path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logging.warning(f"Could not write weather cache {self.cache_path}: {e}")
+
+    def refresh(self):
+        try:
+            temperatures = fetch_temperatures(self.locations)
+        except Exception as e:
+            logging.warning(f"Weather fetch failed for {len(self.locations)} location(s): {e}")
+            self.breaker.record_failure(WEATHER_ENDPOINT)
+            return
+        self.breaker.record_success(WEATHER_ENDPOINT)
+        now = time.time()
+        self.readings = {loc: (temperature, now) for loc, temperature in zip(self.locations, temperatures)}
+        self._save()
+
+    def run(self):
+        network_ready.wait()
+        if not self.locations or http_sessions is None:
+            return
+        while not self._stopping.is_set():
+            # the oldest reading decides; all locations are refreshed together
+            fetched_at = min(self.readings.get(loc, (None, 0))[1] for loc in self.locations)
+            due_at = max(fetched_at + WEATHER_TTL, self.breaker.retry_at(WEATHER_ENDPOINT))
+            now = time.time()
+            if now >= due_at:
+                self.refresh()
+                continue
+            self._stopping.wait(due_at - now)
+
+# === Background fetch worker ===
+# Immutable board for one station: a tuple of pages, each a tuple of departure tuples
+BoardSnapshot = namedtuple("BoardSnapshot", ["station_code", "pages", "fetched_at"])
+# Shown in place of a board older than MAX_STALE_AGE whose refreshes keep failing
+EXPIRED_BOARD = BoardSnapshot(None, (), 0)
+
+# Approximate kB held per station: its board snapshot and its cached calling points
+def memory_report(snapshots):
+    return {
+        code: {
+            "board_kb": round(deep_sizeof(snapshot.pages) / 1024, 1),
+            "details_kb": round(service_details_cache.station_bytes(code) / 1024, 1),
+        }
+        for code, snapshot in snapshots.items()
+    }
+
+# Owns all LDBWS traffic so the render loop never waits on the network.
+# Snapshots are published by swapping in a new dict, so the renderer can read
+# fetcher.snapshots at any time without taking a lock. A failed refresh leaves the
+# last good snapshot in place (stale-while-revalidate) and is recorded in failures.
+# Each due station is refreshed on its own short-lived thread, so the displayed
+# station's requests can overtake a background station's in ldbws_scheduler.
+class BoardFetcher(threading.Thread):
+    def __init__(self, station_codes, keep_all=False):
+        super().__init__(name="board-fetcher", daemon=True)
+        self.station_codes = station_codes
+        # keep_all: refresh every station, not just the displayed one (board server)
+        self.keep_all = keep_all
+        self.snapshots = {}
+        self.failures = {}  # station_code -> time of the first failed refresh since the last good one
+        self.wanted_station = station_codes[0]
+        self.upcoming_station = None
+        self.refreshing = set()
+        self.lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+
+    def request(self, station_code):
+        # Ask for station_code to be the one kept fresh; wakes the worker straight away
+        self.wanted_station = station_code
+        self.upcoming_station = None
+        ldbws_scheduler.promote(("board", station_code), PRIORITY_DISPLAYED)
+        self._wake.set()
+
+    def prefetch(self, station_code):
+        # Keep station_code fresh as well, ahead of rotating to it
+        if station_code != self.upcoming_station:
+            self.upcoming_station = station_code
+            ldbws_scheduler.promote(("board", station_code), PRIORITY_NEXT)
+            self._wake.set()
+
+    def priority(self, code):
+        if code == self.wanted_station:
+            return PRIORITY_DISPLAYED
+        return PRIORITY_NEXT if code == self.upcoming_station else PRIORITY_BACKGROUND
+
+    def stop(self):
+        self._stopping.set()
+        self._wake.set()
+
+    # A station not worth rotating to: its circuit is open and there's no recent board to show
+    def unavailable(self, code):
+        snapshot = self.snapshots.get(code)
+        usable = snapshot is not None and snapshot.pages and time.time() - snapshot.fetched_at <= MAX_STALE_AGE
+        return not usable and station_breaker.is_open(code)
+
+    def _publish(self, snapshot):
+        with self.lock:
+            snapshots = dict(self.snapshots)
+            snapshots[snapshot.station_code] = snapshot
+            self.snapshots = snapshots
+
+    # Record that code's board couldn't be refreshed; its last good board stays up
+    def _mark_failed(self, code):
+        now = time.time()
+        self.failures.setdefault(code, now)
+        snapshot = self.snapshots.get(code)
+        if snapshot is None:
+            # nothing to fall back on; an empty board shows "Live departures unavailable"
+            self._publish(BoardSnapshot(code, (), 0))
+        elif snapshot.fetched_at:
+            # a placeholder from an earlier failure (fetched_at 0) is not a board to serve
+            logging.warning(f"Serving {code} board from {int(now - snapshot.fetched_at)}s ago while LDBWS is failing")
+
+    def refresh(self, code):
+        if not ldbws_breaker.allow(LDBWS_ENDPOINT):
+            # LDBWS as a whole is backing off and nothing is sent, so the station's own
+            # backoff is left alone and it recovers as soon as the endpoint does
+            self._mark_failed(code)
+            return
+        # One board request per refresh; pages are sliced locally from it
+        started = time.perf_counter()
+        with profiler.fetch():
+            departures = fetch_departures(code, self.priority(code))
+        metrics.observe("refresh_seconds", time.perf_counter() - started, station=code)
+        if departures is None:
+            station_breaker.record_failure(code)
+            self._mark_failed(code)
+            return
+
+        pages = tuple(tuple(page) for page in get_paginated_platforms(departures, TRAINSPERSCREEN))
+        self._publish(BoardSnapshot(code, pages, time.time()))
+        self.failures.pop(code, None)
+        station_breaker.record_success(code)
+        logging.debug(f"Service details cache: {service_details_cache.stats()}")
+        logging.debug(f"Memory for {code}: {memory_report({code: self.snapshots[code]})[code]}")
+        logging.debug(f"LDBWS requests: {ldbws_scheduler.stats()}")
+        if http_sessions is not None:
+            logging.debug(f"HTTP connections: {http_sessions.stats()}")
+
+    def due_at(self, code):
+        snapshot = self.snapshots.get(code)
+        fetched_at = snapshot.fetched_at if snapshot else 0
+        return max(fetched_at + UPDATE_INTERVAL, station_breaker.retry_at(code), ldbws_breaker.retry_at(LDBWS_ENDPOINT))
+
+    def _refresh_in_background(self, code):
+        try:
+            self.refresh(code)
+        except Exception as e:
+            logging.exception(f"Board fetch worker failed for {code}: {e}")
+            station_breaker.record_failure(code)
+        finally:
+            with self.lock:
+                self.refreshing.discard(code)
+            self._wake.set()
+
+    def run(self):
+        network_ready.wait()
+        while not self._stopping.is_set():
+            self._wake.clear()
+            codes = self.station_codes if self.keep_all else {self.wanted_station, self.upcoming_station or self.wanted_station}
+            now = time.time()
+            next_due = now + UPDATE_INTERVAL
+            for code in codes:
+                with self.lock:
+                    if code in self.refreshing:
+                        continue
+                due_at = self.due_at(code)
+                if due_at > now:
+                    next_due = min(next_due, due_at)
+                    continue
+                with self.lock:
+                    self.refreshing.add(code)
+                threading.Thread(target=self._refresh_in_background, args=(code,), name=f"refresh-{code}", daemon=True).start()
+            self._wake.wait(timeout=next_due - now)
+
+# === Board server and thin client ===
+# With BOARD_MODE "server" this display also keeps every selected station fresh and
+# serves the boards and temperatures as JSON on BOARD_SERVER_PORT. Displays running
+# with BOARD_MODE "client" poll that instead of LDBWS and Open-Meteo, so upstream
+# traffic is the same however many screens there are.
+BOARD_SERVER_PATH = "/boards"
+
+class BoardServer(threading.Thread):
+    def __init__(self, host, port, fetcher, weather):
+        super().__init__(name="board-server", daemon=True)
+        self.fetcher = fetcher
+        self.weather = weather
+        self.lock = threading.Lock()
+        # ETags carry the start time so a restarted server never matches an old one
+        self.started = int(time.time())
+        self.version = 0
+        self.body = b""
+        self.sources = None  # (snapshots, failures, temperatures) body was encoded from
+        # deferred so displays that don't serve never load http.server
+        from http.server import ThreadingHTTPServer
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+
+    # Re-encodes only when something changed. The fetcher replaces its snapshots dict
+    # rather than mutating it, so identity is enough for the boards.
+    def payload(self):
+        snapshots = self.fetcher.snapshots
+        failures = dict(self.fetcher.failures)
+        temperatures = {code: self.weather.temperature(code) for code in self.fetcher.station_codes}
+        with self.lock:
+            if self.sources is None or self.sources[0] is not snapshots or self.sources[1:] != (failures, temperatures):
+                stations = {
+                    code: {"pages": snapshot.pages, "fetched_at": snapshot.fetched_at, "failing_since": failures.get(code)}
+                    for code, snapshot in snapshots.items()
+                }
+                self.body = json.dumps({"stations": stations, "temperatures": temperatures}).encode("utf-8")
+                self.sources = (snapshots, failures, temperatures)
+                self.version += 1
+            return f'"{self.started}-{self.version}"', self.body
+
+    def _handler(self):
+        from http.server import BaseHTTPRequestHandler
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != BOARD_SERVER_PATH:
+                    self.send_error(404)
+                    return
+                etag, body = server.payload()
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logging.debug(f"Board server {self.address_string()}: {format % args}")
+
+        return Handler
+
+    def run(self):
+        logging.info(f"Board server listening on {self.httpd.server_address[0]}:{self.httpd.server_address[1]}")
+        self.httpd.serve_forever()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+# Stands in for both BoardFetcher and WeatherFetcher on a client display. Snapshots
+# that haven't changed on the server keep their identity, so main() doesn't redraw them.
+class BoardClient(threading.Thread):
+    def __init__(self, url, station_codes):
+        super().__init__(name="board-client", daemon=True)
+        self.url = url.rstrip("/") + BOARD_SERVER_PATH
+        self.station_codes = station_codes
+        self.snapshots = {}
+        self.failures = {}
+        self.temperatures = {}
+        self.etag = None
+        self.unreachable_since = None
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+
+    def request(self, station_code):
+        self._wake.set()
+
+    def prefetch(self, station_code):
+        # the server keeps every station fresh already
+        pass
+
+    def stop(self):
+        self._stopping.set()
+        self._wake.set()
+
+    def temperature(self, station_code):
+        return self.temperatures.get(station_code, "N/A")
+
+    def unavailable(self, code):
+        snapshot = self.snapshots.get(code)
+        usable = snapshot is not None and snapshot.pages and time.time() - snapshot.fetched_at <= MAX_STALE_AGE
+        return not usable and code in self.failures
+
+    def poll(self):
+        headers = {"If-None-Match": self.etag} if self.etag else {}
+        try:
+            r = http_sessions.session(self.url).get(self.url, headers=headers, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT))
+            if r.status_code == 304:
+                self.unreachable_since = None
+                return
+            r.raise_for_status()
+            data = r.json()
+        except Exception as e:
+            if self.unreachable_since is None:
+                logging.warning(f"Board server {self.url} unreachable: {e}")
+                self.unreachable_since = time.time()
+                self.etag = None
+            # every board is now as stale as the server's silence
+            self.failures = {code: self.failures.get(code, self.unreachable_since) for code in self.station_codes}
+            return
+
+        self.unreachable_since = None
+        snapshots = {}
+        failures = {}
+        for code in self.station_codes:
+            station = data["stations"].get(code)
+            if station is None:
+                continue
+            pages = tuple(tuple(Departure(*row) for row in page) for page in station["pages"])
+            snapshot = self.snapshots.get(code)
+            if snapshot is None or snapshot.fetched_at != station["fetched_at"] or snapshot.pages != pages:
+                snapshot = BoardSnapshot(code, pages, station["fetched_at"])
+            snapshots[code] = snapshot
+            if station["failing_since"] is not None:
+                failures[code] = station["failing_since"]
+        self.snapshots = snapshots
+        self.failures = failures
+        self.temperatures = data.get("temperatures", {})
+        self.etag = r.headers.get("ETag")
+
+    def run(self):
+        network_ready.wait()
+        if http_sessions is None:
+            return
+        while not self._stopping.is_set():
+            self.poll()
+            self._wake.wait(timeout=BOARD_CLIENT_POLL_INTERVAL)
+            self._wake.clear()
+
+# === Dirty rectangle renderer ===
+# Keeps one back buffer for the life of the program and pushes only the rectangles
+# marked as changed to the display, rotating each one when ROTATE_DISPLAY is set.
+class DirtyRenderer:
+    def __init__(self, size):
+        self.back = pygame.Surface(size).convert()
+        self.bounds = self.back.get_rect()
+        self.dirty = []
+        self.full = True
+
+    def mark(self, rect):
+        self.dirty.append(pygame.Rect(rect))
+
+    def mark_all(self):
+        self.full = True
+
+    def present(self, screen):
+        if self.full:
+            rects = [self.bounds]
+        else:
+            rects = [rect.clip(self.bounds) for rect in self.dirty]
+            rects = [rect for rect in rects if rect.w and rect.h]
+
+        updated = []
+        for rect in rects:
+            if ROTATE_DISPLAY:
+                target = pygame.Rect(self.bounds.w - rect.right, self.bounds.h - rect.bottom, rect.w, rect.h)
+                screen.blit(pygame.transform.rotate(self.back.subsurface(rect), 180), target)
+            else:
+                target = rect
+                screen.blit(self.back, rect, rect)
+            updated.append(target)
+
+        if updated:
+            pygame.display.update(updated)
+        self.dirty = []
+        self.full = False
+
+# === Frame scheduler ===
+# Runs at SCROLL_FPS while something scrolls and IDLE_FPS when only the clock moves.
+# Frames land on a wall-clock grid so the seconds digit changes on time, and the wait
+# happens in pygame.event.wait so key presses and quit still wake the loop at once.
+# The chosen rate is published as the frame_rate_fps metric.
+class FrameScheduler:
+    def __init__(self):
+        self.fps = SCROLL_FPS
+        metrics.frame_rate = self.fps
+
+    def choose(self, scrolling):
+        fps = SCROLL_FPS if scrolling else IDLE_FPS
+        if fps != self.fps:
+            logging.debug(f"Frame rate {self.fps} -> {fps} fps")
+            self.fps = fps
+            metrics.frame_rate = fps
+            metrics.inc("frame_rate_changes")
+
+    def wait(self):
+        if UNTHROTTLED:
+            # profiling: draw the next frame straight away
+            pygame.event.pump()
+            return
+        period = 1.0 / self.fps
+        delay = period - (time.time() % period)
+        event = pygame.event.wait(max(1, int(delay * 1000)))
+        if event.type != pygame.NOEVENT:
+            # hand it back to the main loop's event handling
+            pygame.event.post(event)
+
+# === Frame export and timing ===
+# Writes every presented frame as numbered PNGs or raw RGB24 to a directory, or to
+# stdout when FRAME_EXPORT_PATH is "-" (raw frames are WINDOW_WIDTH x WINDOW_HEIGHT x 3 bytes).
+class FrameExporter:
+    def __init__(self, path, fmt):
+        self.format = fmt
+        self.count = 0
+        if path == "-":
+            self.stream = sys.stdout.buffer
+            self.directory = None
+            # keep print() output from corrupting the frame stream
+            sys.stdout = sys.stderr
+        else:
+            os.makedirs(path, exist_ok=True)
+            self.directory = path
+            self.stream = open(os.path.join(path, "frames.rgb"), "wb") if fmt == "raw" else None
+
+    def write(self, surface):
+        if self.format == "raw":
+            self.stream.write(pygame.image.tobytes(surface, "RGB"))
+        elif self.directory:
+            pygame.image.save(surface, os.path.join(self.directory, f"frame_{self.count:06d}.png"))
+        else:
+            pygame.image.save(surface, self.stream, "frame.png")
+        self.count += 1
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.flush()
+            if self.directory:
+                self.stream.close()
+
+# Time spent producing each frame, not counting the scheduler's wait
+class FrameStats:
+    def __init__(self, keep=10000):
+        self.times = deque(maxlen=keep)
+        self.frames = 0
+        self.started = time.perf_counter()
+
+    def add(self, seconds):
+        self.times.append(seconds)
+        self.frames += 1
+
+    def summary(self):
+        if not self.times:
+            return "no frames rendered"
+        times = sorted(self.times)
+        elapsed = time.perf_counter() - self.started
+        return (
+            f"{self.frames} frames in {elapsed:.1f}s ({self.frames / elapsed:.1f} fps), "
+            f"frame time mean {1000 * sum(times) / len(times):.2f} ms, "
+            f"p50 {1000 * times[len(times) // 2]:.2f} ms, "
+            f"p95 {1000 * times[int(len(times) * 0.95)]:.2f} ms, "
+            f"max {1000 * times[-1]:.2f} ms"
+        )
+
+# Draws the station name, the clock/temperature box and any data-age notice;
+# returns the rects it covered
+def draw_overlay(surface, current_time, current_temp, station_name, notice=""):
+    clock_text = text_cache.render(clock_font, current_time, ORANGE)
+    temp_text = text_cache.render(train_font, current_temp, ORANGE)
+    station_text = text_cache.render(station_font, station_name, ORANGE)
+
+    clock_x = (WINDOW_WIDTH - clock_text.get_width()) // 2
+    clock_y = WINDOW_HEIGHT - clock_text.get_height() - 20
+    temp_x = clock_x + clock_text.get_width() + 60
+    temp_y = clock_y + (clock_text.get_height() - temp_text.get_height()) // 2
+    station_x = (WINDOW_WIDTH - station_text.get_width()) // 2
+    station_y = 20
+
+    clock_box = pygame.Rect(
+        clock_x-10, clock_y-10,
+        clock_text.get_width() + temp_text.get_width() + 70,
+        clock_text.get_height() + 20
+    )
+    pygame.draw.rect(surface, BLACK, clock_box)
+
+    station_rect = surface.blit(station_text, (station_x, station_y))
+    surface.blit(clock_text, (clock_x, clock_y))
+    surface.blit(temp_text, (temp_x, temp_y))
+    rects = [station_rect, clock_box]
+
+    if notice:
+        notice_text = text_cache.render(status_font, notice, (255,0,0))
+        rects.append(surface.blit(notice_text, (WINDOW_WIDTH - notice_text.get_width() - 30, station_y)))
+    return rects
+
+def compose_static_surface(static_surface, static_text):
+    static_surface.fill(BLACK)
+    for item in static_text:
+        if isinstance(item[0], pygame.Surface):
+            static_surface.blit(item[0], item[1])
+        elif isinstance(item[0], str) and item[0] == "CALLING_AT_LABEL":
+            static_surface.blit(item[2], item[1])
 
 # === Main function ===
 def main():
-    clock = pygame.time.Clock()
-    static_text = []
+    # rendered rows of the displayed station's board, reused across refreshes and pages
+    board_rows = {}
+    # the displayed station's composed pages, and the next station's once the look-ahead has built them
+    view = None
+    prepared = None
+    # spare page surfaces; trimmed to one (for the look-ahead) once the view is complete
+    surface_pool = []
+    # shown until a board arrives, and for "No departures"
+    message_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+    message_surface.fill(BLACK)
+    # what is on screen: one of the view's page surfaces or message_surface, and its scrolling texts
+    static_surface = message_surface
     scrolling_texts = []
-    static_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
-    last_update_time = 0
-    last_temp_update = 0
+    renderer = DirtyRenderer((WINDOW_WIDTH, WINDOW_HEIGHT))
+    scheduler = FrameScheduler()
+    frame_stats = FrameStats()
+    exporter = FrameExporter(FRAME_EXPORT_PATH, FRAME_EXPORT_FORMAT) if FRAME_EXPORT_PATH else None
+    # board_dirty: static_surface changed and the whole back buffer must be rebuilt
+    board_dirty = True
+    overlay_rects = []
+    last_overlay = None
 
     station_codes = list(STATIONS.keys())
     station_index = 0
     current_screen_index = 0
     last_station_rotate = time.time()
     last_screen_rotate = time.time()
-    departures = {}
-    NO_DEPARTURES_COOLDOWN = 60
-    last_successful_fetch = 0
-    allTemp = {code: "N/A" for code in station_codes}
+    # when the displayed station's board turned out empty; None while it has departures
+    empty_since = None
+    # the message on message_surface while empty_since is set
+    shown_message = None
 
     # Initialise first station/page
     STATION_CODE = station_codes[station_index]
     current_station = STATIONS[STATION_CODE]
-    current_temp = allTemp.get(STATION_CODE, "N/A")
 
-    # derived page_count from NSERVICE and TRAINSPERSCREEN
-    page_count = max(1, (NSERVICE + TRAINSPERSCREEN - 1) // TRAINSPERSCREEN)
+    server = None
+    if BOARD_MODE == "client":
+        # boards and temperatures both come from the board server
+        fetcher = weather = BoardClient(BOARD_SERVER_URL, station_codes)
+        fetcher.start()
+    else:
+        fetcher = BoardFetcher(station_codes, keep_all=BOARD_MODE == "server")
+        fetcher.start()
+        weather = WeatherFetcher(STATIONS, WEATHER_CACHE_PATH)
+        weather.start()
+        if BOARD_MODE == "server":
+            server = BoardServer(BOARD_SERVER_HOST, BOARD_SERVER_PORT, fetcher, weather)
+            server.start()
+    metrics_server = None
+    if METRICS_PORT:
+        metrics_server = MetricsServer(METRICS_HOST, METRICS_PORT, fetcher)
+        metrics_server.start()
+    last_metrics_log = time.time()
+    # the snapshot currently on screen; a different object from the fetcher means fresh data
+    displayed_snapshot = None
+    board_shown = False
 
+    profiler.start()
     running = True
     while running:
+        frame_start = time.perf_counter()
         now = time.time()
         for event in pygame.event.get():
             if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
                 running = False
 
-        # --- Update temperature every 10 min ---
-        if now - last_temp_update >= 600:
-            for code in station_codes:
-                stationForTemp = STATIONS[code]
-                allTemp[code] = get_temperature(stationForTemp.get("LATITUDE"), stationForTemp.get("LONGITUDE"))
-            last_temp_update = now
+        # --- Look ahead: fetch and pre-render the next station before rotating to it ---
+        if len(station_codes) > 1 and now - last_station_rotate >= STATION_ROTATE_INTERVAL - PREFETCH_LEAD:
+            next_code = station_codes[next_station_index(station_codes, station_index, fetcher)]
+            fetcher.prefetch(next_code)
+            next_snapshot = fetcher.snapshots.get(next_code)
+            if (next_code != STATION_CODE and next_snapshot is not None and next_snapshot.pages
+                    and now - next_snapshot.fetched_at <= MAX_STALE_AGE
+                    and (prepared is None or prepared.snapshot is not next_snapshot)):
+                rows = prepared.rows if prepared is not None and prepared.code == next_code else {}
+                if prepared is not None:
+                    prepared.release(surface_pool)
+                prepared = StationPages(next_code, next_snapshot, rows, surface_pool, first_only=True)
 
         # --- Rotate stations ---
         station_changed = False
-        if now - last_station_rotate >= STATION_ROTATE_INTERVAL:
-            station_index = (station_index + 1) % len(station_codes)
+        if now - last_station_rotate >= STATION_ROTATE_INTERVAL or (empty_since and now - empty_since >= NO_DEPARTURES_HOLD):
+            station_index = next_station_index(station_codes, station_index, fetcher)
             current_screen_index = 0
             last_station_rotate = now
+            empty_since = None
             station_changed = True
 
         # --- Rotate pages/screens ---
         page_changed = False
         if now - last_screen_rotate >= SCREEN_ROTATE_INTERVAL:
-            # rotate within available page_count
-            current_screen_index = (current_screen_index + 1) % page_count
+            # wrapped to the view's pages below
+            current_screen_index += 1
             last_screen_rotate = now
             page_changed = True
 
-        # --- Fetch departures & update display (attempt pages without using continue) ---
-        draw_ready = False
-        # Only refresh when needed
-        if station_changed or page_changed or now - last_update_time >= UPDATE_INTERVAL:
+        if station_changed:
             STATION_CODE = station_codes[station_index]
             current_station = STATIONS[STATION_CODE]
-            current_temp = allTemp.get(STATION_CODE, "N/A")
-
-            if station_changed:
-                current_screen_index = 0
-
-            # Try up to page_count pages starting from current_screen_index
-            attempts = 0
-            start_index = current_screen_index
-            while attempts < page_count:
-                idx = (start_index + attempts) % page_count
-                departures = fetch_departures(STATION_CODE, idx)
-
-                success = update_display_multi_platform_with_calling_at(departures, static_text, scrolling_texts)
-                if success:
-                    # prepare the static_surface from static_text
-                    static_surface.fill(BLACK)
-                    for item in static_text:
-                        if isinstance(item[0], pygame.Surface):
-                            static_surface.blit(item[0], item[1])
-                        elif isinstance(item[0], str) and item[0] == "CALLING_AT_LABEL":
-                            static_surface.blit(item[2], item[1])
-                    last_update_time = now
-                    draw_ready = True
-                    # set current_screen_index to the page we actually displayed
-                    current_screen_index = idx
-                    break
-                else:
-                    attempts += 1
-
-            if not draw_ready:
-                # Nothing found on any page for this station — show a fallback message and back off
-                logging.info(f"No departures for station {STATION_CODE} on any page. Backing off {NO_DEPARTURES_COOLDOWN}s.")
-                # make a simple "No departures" static surface so we don't show a stale/blank frame
-                static_surface.fill(BLACK)
-                no_dep_text = train_font.render("No departures", True, ORANGE)
-                station_name_text = station_font.render(current_station.get("NAME", ""), True, ORANGE)
-                static_surface.blit(station_name_text, ((WINDOW_WIDTH - station_name_text.get_width())//2, 40))
-                static_surface.blit(no_dep_text, ((WINDOW_WIDTH - no_dep_text.get_width())//2, WINDOW_HEIGHT//2 - no_dep_text.get_height()//2))
-                screen.blit(static_surface, (0,0))
-                pygame.display.flip()
-
-                # advance to next station and back off
-                station_index = (station_index + 1) % len(station_codes)
-                last_station_rotate = now
-                last_update_time = now
-                # gentle backoff — sleep while keeping the UI responsive for a short time
-                backoff_end = time.time() + NO_DEPARTURES_COOLDOWN
-                while time.time() < backoff_end:
-                    for event in pygame.event.get():
-                        if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
-                            running = False
-                            break
-                    # update clock display while waiting
-                    current_time = datetime.now().strftime("%H:%M:%S")
-                    clock_text = clock_font.render(current_time, True, ORANGE)
-                    frame_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
-                    frame_surface.blit(static_surface, (0, 0))
-                    frame_surface.blit(clock_text, ((WINDOW_WIDTH - clock_text.get_width())//2, WINDOW_HEIGHT - clock_text.get_height() - 20))
-                    screen.blit(frame_surface, (0,0))
-                    pygame.display.flip()
-                    clock.tick(1)  # low framerate during backoff
-
-        # --- Draw frame (regular) ---
-        frame_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
-        frame_surface.blit(static_surface, (0,0))
+            fetcher.request(STATION_CODE)
+            board_dirty = True
+            if view is not None:
+                view.release(surface_pool)
+                view = None
+            if prepared is not None and prepared.code == STATION_CODE and prepared.find_page(0) is not None:
+                # already composed by the look-ahead: show its first page
+                view, prepared = prepared, None
+                board_rows = view.rows
+                displayed_snapshot = view.snapshot
+                current_screen_index = view.find_page(0)
+                static_surface, scrolling_texts = view.pages[current_screen_index]
+            else:
+                # blank until the station's board arrives
+                board_rows = {}
+                message_surface.fill(BLACK)
+                static_surface = message_surface
+                scrolling_texts = []
+                displayed_snapshot = None
+            if prepared is not None:
+                prepared.release(surface_pool)
+                prepared = None
+        elif view is not None and view.pending:
+            # the frame after switching to a look-ahead view: compose the rest of its pages
+            view.compose(surface_pool)
+        current_temp = weather.temperature(STATION_CODE)
+
+        # --- Update display from the latest snapshot (never waits on the network) ---
+        # A stale board is shown while it refreshes, up to MAX_STALE_AGE
+        snapshot = fetcher.snapshots.get(STATION_CODE)
+        failed_since = fetcher.failures.get(STATION_CODE)
+        data_age = now - snapshot.fetched_at if snapshot else 0
+        if snapshot is not None and data_age > MAX_STALE_AGE:
+            snapshot = EXPIRED_BOARD if failed_since else None
+        if snapshot is not None and snapshot is not displayed_snapshot:
+            # fresh data: compose every page now, so page flips until the next refresh are swaps
+            if view is not None:
+                view.release(surface_pool)
+            view = StationPages(STATION_CODE, snapshot, board_rows, surface_pool)
+            displayed_snapshot = snapshot
+            page_changed = True
+
+        # Nothing to show is only "No departures" when the board actually loaded; while
+        # refreshes fail (a station never loaded, or a board expired) the data is missing
+        empty_message = "Live departures unavailable" if failed_since else "No departures"
+        if view is not None and (page_changed or (empty_since is not None and shown_message != empty_message)):
+            board_dirty = True
+            idx = view.find_page(current_screen_index)
+            if idx is not None:
+                current_screen_index = idx
+                static_surface, scrolling_texts = view.pages[idx]
+                empty_since = None
+            else:
+                # Nothing on any page: say so, and move on after NO_DEPARTURES_HOLD.
+                # Scrolling, the clock and the fetcher keep running meanwhile.
+                if empty_since is None:
+                    logging.info(f"{empty_message} for station {STATION_CODE}; moving on in {NO_DEPARTURES_HOLD}s")
+                    empty_since = now
+                message_text = text_cache.render(train_font, empty_message, ORANGE)
+                compose_static_surface(message_surface, [(message_text, ((WINDOW_WIDTH - message_text.get_width())//2, WINDOW_HEIGHT//2 - message_text.get_height()//2))])
+                shown_message = empty_message
+                static_surface = message_surface
+                scrolling_texts = []
+
+        if view is None or not view.pending:
+            del surface_pool[1:]
+
+        # --- Draw frame: only what changed goes to the display ---
+        update_done = time.perf_counter()
+        if board_dirty:
+            renderer.back.blit(static_surface, (0, 0))
+            renderer.mark_all()
+            overlay_rects = []
+            last_overlay = None
+            board_dirty = False
 
+        text_height = train_font.get_height()
+        overlay_hit = False
         for text in scrolling_texts:
-            clip_rect = pygame.Rect(text.x_start, text.y_pos, text.clip_width, train_font.get_height())
+            clip_rect = pygame.Rect(text.x_start, text.y_pos, text.clip_width, text_height)
+            # restore the strip's background, then draw the text at its new offset
+            renderer.back.blit(static_surface, clip_rect, clip_rect)
             text.update()
-            text.draw(frame_surface, clip_rect)
+            text.draw(renderer.back, clip_rect)
+            renderer.mark(clip_rect)
+            overlay_hit = overlay_hit or clip_rect.collidelist(overlay_rects) != -1
 
-        # --- Clock, temperature, station ---
+        # --- Clock, temperature, station (redrawn when the text changes) ---
+        scroll_done = time.perf_counter()
         current_time = datetime.now().strftime("%H:%M:%S")
-        clock_text = clock_font.render(current_time, True, ORANGE)
-        temp_text = train_font.render(current_temp, True, ORANGE)
-        station_text = station_font.render(current_station.get("NAME", ""), True, ORANGE)
-
-        clock_x = (WINDOW_WIDTH - clock_text.get_width()) // 2
-        clock_y = WINDOW_HEIGHT - clock_text.get_height() - 20
-        temp_x = clock_x + clock_text.get_width() + 60
-        temp_y = clock_y + (clock_text.get_height() - temp_text.get_height()) // 2
-        station_x = (WINDOW_WIDTH - station_text.get_width()) // 2
-        station_y = 20
-
-        pygame.draw.rect(frame_surface, BLACK, (
-            clock_x-10, clock_y-10,
-            clock_text.get_width() + temp_text.get_width() + 70,
-            clock_text.get_height() + 20
-        ))
-
-        frame_surface.blit(station_text, (station_x, station_y))
-        frame_surface.blit(clock_text, (clock_x, clock_y))
-        frame_surface.blit(temp_text, (temp_x, temp_y))
+        notice = ""
+        if not network_ready.is_set():
+            notice = "Connecting..."
+        elif failed_since and displayed_snapshot is not None and displayed_snapshot.pages:
+            notice = f"Updated {int(data_age // 60)} min ago"
+        overlay = (current_time, current_temp, current_station.get("NAME", ""), notice)
+        if overlay != last_overlay or overlay_hit:
+            for rect in overlay_rects:
+                renderer.back.blit(static_surface, rect, rect)
+                renderer.mark(rect)
+            overlay_rects = draw_overlay(renderer.back, *overlay)
+            for rect in overlay_rects:
+                renderer.mark(rect)
+            last_overlay = overlay
 
-        if ROTATE_DISPLAY:
-            frame_surface = pygame.transform.rotate(frame_surface, 180)
+        overlay_done = time.perf_counter()
+        renderer.present(screen)
+        frame_done = time.perf_counter()
+        frame_stats.add(frame_done - frame_start)
+        metrics.observe_frame(frame_done - frame_start, (
+            update_done - frame_start, scroll_done - update_done, overlay_done - scroll_done, frame_done - overlay_done,
+        ))
+        if METRICS_LOG_INTERVAL and now - last_metrics_log >= METRICS_LOG_INTERVAL:
+            logging.info(f"Metrics: {metrics.summary(fetcher)}")
+            last_metrics_log = now
+        if frame_stats.frames == 1:
+            log_startup("first frame")
+        if not board_shown and displayed_snapshot is not None:
+            log_startup("first board")
+            board_shown = True
+        if exporter:
+            exporter.write(screen)
+        if MAX_FRAMES and frame_stats.frames >= MAX_FRAMES:
+            running = False
 
-        screen.blit(frame_surface, (0,0))
-        pygame.display.flip()
-        clock.tick(60)
+        scheduler.choose(bool(scrolling_texts))
+        scheduler.wait()
 
+    profiler.close()
+    logging.info(f"Memory per station: {memory_report(fetcher.snapshots)}")
+    logging.info(f"Metrics: {metrics.summary(fetcher)}")
+    summary = frame_stats.summary()
+    logging.info(f"Render: {summary}")
+    print(f"Render: {summary}", file=sys.stderr)
+    if http_sessions is not None:
+        logging.info(f"HTTP connections: {http_sessions.stats()}")
+        http_sessions.close()
+    if exporter:
+        exporter.close()
+    fetcher.stop()
+    weather.stop()
+    if server:
+        server.stop()
+    if metrics_server:
+        metrics_server.stop()
     pygame.quit()
 
 if __name__ == "__main__":
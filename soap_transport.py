@@ -0,0 +1,229 @@
+import hashlib
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from zeep.transports import Transport
+
+# === Pooled HTTP sessions ===
+# One keep-alive requests.Session per host, shared by everything that talks to that
+# host, so LDBWS and weather calls reuse their TCP+TLS connections instead of paying
+# the handshake on every request. pool_size should cover the threads that call one
+# host at once (the details workers plus the board fetcher).
+class SessionPool:
+    def __init__(self, pool_size=4):
+        self.pool_size = pool_size
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def session(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            session = self.sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_maxsize=self.pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+                self.sessions[host] = session
+        return session
+
+    # Requests made and connections opened per host; every request beyond the first
+    # on a connection is a reuse.
+    def stats(self):
+        with self.lock:
+            sessions = list(self.sessions.items())
+        stats = {}
+        for host, session in sessions:
+            made = opened = 0
+            for adapter in set(session.adapters.values()):
+                # zeep mounts a file:// adapter on the session too; it has no pool
+                if not hasattr(adapter, "poolmanager"):
+                    continue
+                pools = adapter.poolmanager.pools
+                for key in list(pools.keys()):
+                    pool = pools.get(key)
+                    if pool is not None:
+                        made += pool.num_requests
+                        opened += pool.num_connections
+            stats[host] = {"requests": made, "connections": opened, "reused": max(0, made - opened)}
+        return stats
+
+    def close(self):
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
+
+
+# === WSDL/XSD document cache ===
+# Serves the OpenLDBWS WSDL and the XSDs it imports from disk, so the SOAP client can
+# be built without the network (and without waiting for it). Documents are stored per
+# WSDL version; revalidate() refreshes them in the background for the next start.
+# Each SOAP call's HTTP round trip is timed per thread (last_post_seconds()), so callers
+# can tell time on the wire from zeep building the envelope and parsing the reply.
+class CachingTransport(Transport):
+    def __init__(self, cache_dir, version, **kwargs):
+        super().__init__(**kwargs)
+        self.cache_dir = os.path.join(cache_dir, version)
+        self.served_from_cache = []
+        self.timing = threading.local()
+
+    def post_xml(self, address, envelope, headers):
+        started = time.perf_counter()
+        try:
+            return self._post_xml(address, envelope, headers)
+        finally:
+            self.timing.post_seconds = time.perf_counter() - started
+
+    def _post_xml(self, address, envelope, headers):
+        return super().post_xml(address, envelope, headers)
+
+    # Seconds the calling thread's last post_xml took, or None if it has not made one
+    # since clear_post_seconds()
+    def last_post_seconds(self):
+        return getattr(self.timing, "post_seconds", None)
+
+    def clear_post_seconds(self):
+        self.timing.post_seconds = None
+
+    def _cache_path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".xml")
+
+    def _store(self, path, content):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def load(self, url):
+        if not url.startswith(("http://", "https://")):
+            return super().load(url)
+
+        path = self._cache_path(url)
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+            self.served_from_cache.append(url)
+            return content
+        except FileNotFoundError:
+            pass
+
+        content = super().load(url)
+        try:
+            self._store(path, content)
+        except OSError as e:
+            logging.warning(f"Could not cache {url}: {e}")
+        return content
+
+    # Re-download every document that was served from disk and replace the ones that
+    # changed. Returns the number of documents updated.
+    def revalidate(self):
+        changed = 0
+        for url in list(self.served_from_cache):
+            try:
+                content = super().load(url)
+            except Exception as e:
+                logging.warning(f"WSDL revalidation skipped, {url} unavailable: {e}")
+                return changed
+
+            path = self._cache_path(url)
+            with open(path, "rb") as f:
+                cached = f.read()
+            if content != cached:
+                self._store(path, content)
+                changed += 1
+
+        if changed:
+            logging.info(f"WSDL cache refreshed {changed} document(s); changes apply on next start")
+        return changed
+
+
+# === Record/replay transport ===
+# "record" passes calls through to LDBWS and saves each response body under
+# cache_dir/<version>/, next to the cached WSDL. "replay" serves those files with no
+# network at all. Replayed calls get simulated latency and jitter, and a share of
+# them can be turned into 503s or timeouts to rehearse upstream trouble.
+# Responses are keyed by operation plus the station code or service id in the request.
+class RecordReplayTransport(CachingTransport):
+    KEY_ELEMENTS = ("crs", "serviceID")
+
+    def __init__(self, cache_dir, version, mode="replay", latency=0.0, jitter=0.0,
+                 error_rate=0.0, timeout_rate=0.0, timeout_after=5.0, seed=None, **kwargs):
+        super().__init__(cache_dir, version, **kwargs)
+        self.mode = mode
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_after = timeout_after
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = Counter()
+        self.failures = Counter()
+
+    def _recording_path(self, headers, envelope):
+        operation = headers.get("SOAPAction", "").strip('"').rstrip("/").rsplit("/", 1)[-1] or "unknown"
+        key = ""
+        for element in envelope.iter():
+            if isinstance(element.tag, str) and element.tag.rsplit("}", 1)[-1] in self.KEY_ELEMENTS:
+                key = element.text or ""
+                break
+        name = re.sub(r"[^A-Za-z0-9_-]", "_", f"{operation}_{key}" if key else operation)
+        return operation, os.path.join(self.cache_dir, "responses", name + ".xml")
+
+    def _response(self, address, status, content, content_type="text/xml; charset=utf-8"):
+        response = requests.Response()
+        response.status_code = status
+        response._content = content
+        response.headers = CaseInsensitiveDict({"Content-Type": content_type})
+        response.url = address
+        response.encoding = "utf-8"
+        return response
+
+    # Replayed latency and timeouts count as transport time, like the real round trip
+    def _post_xml(self, address, envelope, headers):
+        operation, path = self._recording_path(headers, envelope)
+        with self.lock:
+            self.calls[operation] += 1
+
+        if self.mode == "record":
+            response = super()._post_xml(address, envelope, headers)
+            if response.status_code == 200:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(response.content)
+            return response
+
+        with self.lock:
+            roll = self.random.random()
+            delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+        if roll < self.timeout_rate:
+            time.sleep(self.timeout_after)
+            with self.lock:
+                self.failures["timeout"] += 1
+            raise requests.exceptions.ReadTimeout(f"Replayed timeout for {operation}")
+        time.sleep(delay)
+        if roll < self.timeout_rate + self.error_rate:
+            with self.lock:
+                self.failures["503"] += 1
+            return self._response(address, 503, b"Service Unavailable", "text/html")
+
+        try:
+            with open(path, "rb") as f:
+                return self._response(address, 200, f.read())
+        except FileNotFoundError:
+            with self.lock:
+                self.failures["missing"] += 1
+            logging.warning(f"No recording for {operation} at {path}")
+            return self._response(address, 500, b"No recording", "text/html")
@@ -0,0 +1,62 @@
+# Tests for departure_boardmk2's ServiceDetailsCache
+#
+#   python3 -m unittest test_service_details_cache
+
+import json
+import os
+import tempfile
+import time
+import unittest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_board():
+    with open(os.path.join(HERE, "configmk2.json")) as f:
+        config = json.load(f)
+    config.update({"HEADLESS": True, "TEST_MODE": True})
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump(config, f)
+        config_path = f.name
+    os.environ["DEPARTURE_BOARD_CONFIG"] = config_path
+    os.chdir(HERE)
+    try:
+        import departure_boardmk2 as board
+    finally:
+        os.unlink(config_path)
+    return board
+
+
+board = load_board()
+
+
+class ServiceDetailsCacheTest(unittest.TestCase):
+    def test_expiry_of_one_batch_is_spread_out(self):
+        cache = board.ServiceDetailsCache(600, 500)
+        before = time.time()
+        for i in range(100):
+            cache.put(f"service-{i}", ())
+        lifetimes = [expires_at - before for expires_at, _ in cache.entries.values()]
+
+        self.assertTrue(all(0.75 * 600 - 1 <= lifetime <= 600 + 1 for lifetime in lifetimes))
+        # a batch put in one refresh must not all come due in the same later refresh
+        self.assertGreater(max(lifetimes) - min(lifetimes), 0.1 * 600)
+        self.assertGreater(len({round(lifetime) for lifetime in lifetimes}), 50)
+
+    def test_no_jitter_expires_together(self):
+        cache = board.ServiceDetailsCache(600, 500, jitter=0)
+        for i in range(10):
+            cache.put(f"service-{i}", ())
+        expiries = [expires_at for expires_at, _ in cache.entries.values()]
+        self.assertLess(max(expiries) - min(expiries), 1)
+
+    def test_expired_entries_are_missing(self):
+        cache = board.ServiceDetailsCache(600, 500)
+        cache.put("fresh", ())
+        cache.put("stale", ())
+        cache.entries["stale"] = (time.time() - 1, ())
+        self.assertEqual(cache.missing(["fresh", "stale"]), ["stale"])
+
+
+if __name__ == "__main__":
+    unittest.main()